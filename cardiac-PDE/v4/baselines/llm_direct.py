@@ -17,7 +17,18 @@ import numpy as np
 
 
 class FentonKarmaSolver:
-    """Canonical Fenton-Karma 3V reference solver (NumPy, Neumann BCs)."""
+    """
+    Canonical Fenton-Karma 3V reference solver (NumPy, Neumann BCs).
+
+    Fields may carry leading batch axes, e.g. ic arrays of shape (B, H, W)
+    from DataSource.load_batch(), to step B samples in one vectorized pass.
+
+    run() stores the sampled snapshots, or — when a sink callable is given —
+    passes each one to sink(t, frame) instead and returns an empty dict, so
+    an online evaluator (metrics.streaming.OnlineEvaluator) needs only one
+    frame in memory. step() returns fresh arrays, so sinks may keep them.
+    Time spent in the sink is excluded from wall_time_s (see sink_time_s).
+    """
 
     DEFAULTS = dict(
         D=0.001, C_m=1.0,
@@ -32,44 +43,68 @@ class FentonKarmaSolver:
         self.p = {**self.DEFAULTS, **kwargs}
 
     def _lap(self, f: np.ndarray) -> np.ndarray:
-        pad = np.pad(f, 1, mode="edge")
-        return (pad[2:, 1:-1] + pad[:-2, 1:-1] +
-                pad[1:-1, 2:] + pad[1:-1, :-2] - 4 * f) / self.p["dx"] ** 2
+        # Pad only the two spatial axes so leading batch axes pass through
+        pad = np.pad(f, [(0, 0)] * (f.ndim - 2) + [(1, 1), (1, 1)], mode="edge")
+        return (pad[..., 2:, 1:-1] + pad[..., :-2, 1:-1] +
+                pad[..., 1:-1, 2:] + pad[..., 1:-1, :-2] - 4 * f) / self.p["dx"] ** 2
 
-    def step(self, u, v, w):
+    def currents(self, u, v, w):
+        """Ionic currents (I_fi, I_so, I_si) and the gate H = [u ≥ V_c]."""
         p = self.p
         H = (u >= p["V_c"]).astype(float)
-        Hv = (u >= p["V_v"]).astype(float)
         I_fi = -v * H * (u - p["V_c"]) * (1 - u) / p["tau_d"]
         I_so = u * (1 - H) / p["tau_0"] + H / p["tau_r"]
         I_si = -w * (1 + np.tanh(p["K"] * (u - p["V_csi"]))) / (2 * p["tau_si"])
-        tau_mv = np.where(Hv < 1, p["tau_v1"], p["tau_v2"])
-        du = p["D"] * self._lap(u) - (I_fi + I_so + I_si) / p["C_m"]
-        dv = (1 - v) * (1 - H) / tau_mv - v * H / p["tau_pv"]
-        dw = (1 - w) * (1 - H) / p["tau_mw"] - w * H / p["tau_pw"]
+        return I_fi, I_so, I_si, H
+
+    def reaction(self, u, v, w):
+        """
+        Local (non-diffusive) right-hand sides (f_u, f_v, f_w), so that
+        du/dt = D Δu + f_u. Pointwise: fields of any shape work, including
+        1-D arrays of values gathered at selected grid points
+        (baselines.deim_rom evaluates them that way).
+        """
+        p = self.p
+        I_fi, I_so, I_si, H = self.currents(u, v, w)
+        tau_mv = np.where(u >= p["V_v"], p["tau_v2"], p["tau_v1"])
+        fu = -(I_fi + I_so + I_si) / p["C_m"]
+        fv = (1 - v) * (1 - H) / tau_mv - v * H / p["tau_pv"]
+        fw = (1 - w) * (1 - H) / p["tau_mw"] - w * H / p["tau_pw"]
+        return fu, fv, fw
+
+    def step(self, u, v, w):
+        p = self.p
+        fu, dv, dw = self.reaction(u, v, w)
+        du = p["D"] * self._lap(u) + fu
         return (np.clip(u + p["dt"] * du, 0, 1),
                 np.clip(v + p["dt"] * dv, 0, 1),
                 np.clip(w + p["dt"] * dw, 0, 1))
 
-    def run(self, ic, t_end, sample_times):
+    def run(self, ic, t_end, sample_times, sink=None):
         u, v, w = ic["u"].copy(), ic["v"].copy(), ic["w"].copy()
         t, sample_set = 0.0, set(sample_times)
         n_steps = int(round(t_end / self.p["dt"]))
-        snaps = {}
+        snaps, sink_time = {}, 0.0
         tracemalloc.start()
         t0 = time.perf_counter()
         for _ in range(n_steps):
             u, v, w = self.step(u, v, w)
             t = round(t + self.p["dt"], 6)
             if t in sample_set:
-                snaps[t] = {"u": u.copy(), "v": v.copy(), "w": w.copy()}
-        wall = time.perf_counter() - t0
+                if sink is not None:
+                    ts = time.perf_counter()
+                    sink(t, {"u": u, "v": v, "w": w})
+                    sink_time += time.perf_counter() - ts
+                else:
+                    snaps[t] = {"u": u.copy(), "v": v.copy(), "w": w.copy()}
+        wall = time.perf_counter() - t0 - sink_time
         _, peak = tracemalloc.get_traced_memory(); tracemalloc.stop()
-        return snaps, {"wall_time_s": wall, "peak_mem_mb": peak/1e6, "bug_free": True}
+        return snaps, {"wall_time_s": wall, "peak_mem_mb": peak/1e6, "bug_free": True,
+                       "sink_time_s": sink_time}
 
 
 class AlievPanfilovSolver:
-    """Canonical Aliev-Panfilov 2V reference solver."""
+    """Canonical Aliev-Panfilov 2V reference solver (batch axes as for FentonKarmaSolver)."""
 
     DEFAULTS = dict(D=0.001, a=0.1, k=8.0, eps_0=0.01, mu1=0.07, mu2=0.3,
                     dt=0.025, dx=0.0390625)
@@ -78,9 +113,10 @@ class AlievPanfilovSolver:
         self.p = {**self.DEFAULTS, **kwargs}
 
     def _lap(self, f):
-        pad = np.pad(f, 1, mode="edge")
-        return (pad[2:, 1:-1] + pad[:-2, 1:-1] +
-                pad[1:-1, 2:] + pad[1:-1, :-2] - 4 * f) / self.p["dx"] ** 2
+        # Pad only the two spatial axes so leading batch axes pass through
+        pad = np.pad(f, [(0, 0)] * (f.ndim - 2) + [(1, 1), (1, 1)], mode="edge")
+        return (pad[..., 2:, 1:-1] + pad[..., :-2, 1:-1] +
+                pad[..., 1:-1, 2:] + pad[..., 1:-1, :-2] - 4 * f) / self.p["dx"] ** 2
 
     def step(self, u, v):
         p = self.p
@@ -89,21 +125,27 @@ class AlievPanfilovSolver:
         dv = eps * (-v - p["k"] * u * (u - p["a"] - 1))
         return np.clip(u + p["dt"] * du, 0, 1), np.clip(v + p["dt"] * dv, 0, 1)
 
-    def run(self, ic, t_end, sample_times):
+    def run(self, ic, t_end, sample_times, sink=None):
         u, v = ic["u"].copy(), ic["v"].copy()
         t, sample_set = 0.0, set(sample_times)
         n_steps = int(round(t_end / self.p["dt"]))
-        snaps = {}
+        snaps, sink_time = {}, 0.0
         tracemalloc.start()
         t0 = time.perf_counter()
         for _ in range(n_steps):
             u, v = self.step(u, v)
             t = round(t + self.p["dt"], 6)
             if t in sample_set:
-                snaps[t] = {"u": u.copy(), "v": v.copy()}
-        wall = time.perf_counter() - t0
+                if sink is not None:
+                    ts = time.perf_counter()
+                    sink(t, {"u": u, "v": v})
+                    sink_time += time.perf_counter() - ts
+                else:
+                    snaps[t] = {"u": u.copy(), "v": v.copy()}
+        wall = time.perf_counter() - t0 - sink_time
         _, peak = tracemalloc.get_traced_memory(); tracemalloc.stop()
-        return snaps, {"wall_time_s": wall, "peak_mem_mb": peak/1e6, "bug_free": True}
+        return snaps, {"wall_time_s": wall, "peak_mem_mb": peak/1e6, "bug_free": True,
+                       "sink_time_s": sink_time}
 
 
 class LLMDirectBaseline:
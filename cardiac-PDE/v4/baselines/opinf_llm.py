@@ -8,7 +8,8 @@ Two-phase approach
 ------------------
 Phase 1 — Offline (fit):
   1. Collect snapshot trajectories at training parameter values.
-  2. Compute a shared POD basis Φ ∈ ℝ^(n × r) via truncated SVD.
+  2. Compute a shared POD basis Φ ∈ ℝ^(n × r) via truncated SVD
+     (method of snapshots or randomized SVD, see baselines/pod.py).
   3. Project each trajectory to the reduced space: r̂ = Φᵀ u.
   4. Estimate time derivatives via 2nd-order finite differences.
   5. Solve the least-squares system to learn operators A, H, c:
@@ -44,51 +45,224 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import time
 import tracemalloc
 import warnings
-from typing import Optional
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Union
 
 import numpy as np
 from scipy.integrate import solve_ivp
-from scipy.linalg import lstsq
+from scipy.interpolate import RBFInterpolator
+from scipy import sparse
+from scipy.linalg import block_diag, lstsq
 
-from data.base import DatasetMetadata
+from baselines.pod import (
+    IncrementalPOD, align_basis, grassmann_exp, grassmann_log, pod_basis, select_pod_method,
+)
+from data.base import DatasetMetadata, new_hasher, snapshot_digest
 
 logger = logging.getLogger(__name__)
 
+Frame = dict[str, np.ndarray]
+# A trajectory as {t: frame} or as (t, frame) pairs in time order
+TrajectoryStream = Union[dict[float, Frame], Iterable[tuple[float, Frame]]]
+
 
 # ---------------------------------------------------------------------------
 # Helper: Kronecker (quadratic) feature
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=None)
+def _triu(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Row/column indices of the upper triangle of an n×n matrix (cached)."""
+    return np.triu_indices(n)
+
+
 def _kron_quadratic(r: np.ndarray) -> np.ndarray:
     """
     Unique quadratic feature vector for a state r of length n_r.
     Uses only the upper-triangle of r ⊗ r to avoid redundancy.
     Length = n_r*(n_r+1)//2.
     """
-    n = len(r)
-    out = np.empty(n * (n + 1) // 2)
-    k = 0
-    for i in range(n):
-        for j in range(i, n):
-            out[k] = r[i] * r[j]
-            k += 1
-    return out
+    i, j = _triu(len(r))
+    return r[i] * r[j]
 
 
 def _kron_quadratic_batch(R: np.ndarray) -> np.ndarray:
-    """Vectorised version for R of shape (T, n_r)."""
-    T, n = R.shape
-    m = n * (n + 1) // 2
-    out = np.empty((T, m))
-    k = 0
-    for i in range(n):
-        for j in range(i, n):
-            out[:, k] = R[:, i] * R[:, j]
-            k += 1
-    return out
+    """Vectorised version for R of shape (T, n_r); returns a (T, n_quad) view."""
+    i, j = _triu(R.shape[1])
+    RT = np.ascontiguousarray(R.T)  # gather whole rows, not strided columns
+    return (RT[i] * RT[j]).T
+
+
+def _quadratic_jacobian_tensor(H: np.ndarray, n: int) -> np.ndarray:
+    """
+    S (n, n, n) with ∂(H q(r))/∂r = S·r (contracting the last axis), for the
+    compact H (n, n(n+1)/2) acting on q(r) = upper triangle of r⊗r:
+    H q(r) = rᵀ T r with T[:, i, j] = H[:, k(i, j)] for i ≤ j, so S = T + Tᵀ.
+    """
+    i, j = _triu(n)
+    T = np.zeros((H.shape[0], n, n))
+    T[:, i, j] = H
+    return T + T.transpose(0, 2, 1)
+
+
+def _change_coordinates(
+    A: np.ndarray,
+    H: Optional[np.ndarray],
+    c: np.ndarray,
+    Q: np.ndarray,
+) -> tuple[np.ndarray, Optional[np.ndarray], np.ndarray]:
+    """Operators of the same ROM in coordinates r̃ = Qᵀ r (Q orthogonal)."""
+    n = len(A)
+    if np.array_equal(Q, np.eye(n)):
+        return A, H, c
+    H_new = None
+    if H is not None:
+        # Symmetric tensor Ts with H q(r) = Σ_ij Ts[:, i, j] r_i r_j
+        Ts = _quadratic_jacobian_tensor(H, n) / 2
+        Ts = np.einsum("ia,ijk,jb,kc->abc", Q, Ts, Q, Q, optimize=True)
+        i, j = _triu(n)
+        H_new = Ts[:, i, j] * np.where(i == j, 1.0, 2.0)
+    return Q.T @ A @ Q, H_new, Q.T @ c
+
+
+def _interpolate_stack(
+    xi: np.ndarray,
+    vals: np.ndarray,
+    target: float,
+    interpolant: str,
+    poly_degree: int,
+) -> np.ndarray:
+    """Interpolate stacked values (n_params, …) at target in one solve."""
+    flat = vals.reshape(len(xi), -1)
+    if interpolant == "rbf":
+        out = RBFInterpolator(xi[:, None], flat)(np.array([[target]]))[0]
+    else:
+        deg = len(xi) - 1 if interpolant == "lagrange" else poly_degree
+        coeffs, _, _, _ = np.linalg.lstsq(np.vander(xi, deg + 1), flat, rcond=None)
+        out = np.vander([target], deg + 1)[0] @ coeffs
+    return out.reshape(vals.shape[1:])
+
+
+_INTERPOLANTS = ("poly", "lagrange", "rbf")
+
+# Bump when the save() layout changes; older files are then refitted
+_SAVE_FORMAT = 1
+
+# solve_ivp methods that use a Jacobian
+_IMPLICIT_METHODS = ("Radau", "BDF", "LSODA")
+
+
+class _NormalEquations:
+    """
+    Running DᵀD and DᵀR of the OpInf regression D O ≈ dR/dt, where each
+    row of D is [r, r⊗r, 1]. Trajectories are added one at a time, so D
+    itself is never stored.
+    """
+
+    def __init__(self, use_quadratic: bool):
+        self.use_quadratic = use_quadratic
+        self.DtD: Optional[np.ndarray] = None
+        self.DtR: Optional[np.ndarray] = None
+        self.dRdR: Optional[np.ndarray] = None   # Σ (dR/dt)² per reduced coordinate
+        self.n_rows = 0
+
+    def add(self, times: list[float], R: np.ndarray) -> None:
+        """Add one reduced trajectory R (T, r) sampled at times."""
+        # 2nd-order finite differences for time derivatives
+        dR = np.gradient(R, np.mean(np.diff(times)), axis=0)
+        cols = [R]
+        if self.use_quadratic:
+            cols.append(_kron_quadratic_batch(R))
+        cols.append(np.ones((len(R), 1)))
+        D = np.concatenate(cols, axis=1)  # (T, n_terms)
+        if self.DtD is None:
+            self.DtD = np.zeros((D.shape[1], D.shape[1]))
+            self.DtR = np.zeros((D.shape[1], R.shape[1]))
+            self.dRdR = np.zeros(R.shape[1])
+        self.DtD += D.T @ D
+        self.DtR += D.T @ dR
+        self.dRdR += np.einsum("ij,ij->j", dR, dR)
+        self.n_rows += len(R)
+
+    def solve(self, regularisation: float) -> np.ndarray:
+        """Tikhonov regularised least squares: min ‖D O - dR/dt‖ + λ‖O‖."""
+        I = np.eye(len(self.DtD)) * regularisation
+        O, _, _, _ = lstsq(self.DtD + I, self.DtR)
+        return O
+
+    def subproblem(self, sel: np.ndarray, n: int) -> "_EigenSolver":
+        """
+        The regression restricted to reduced coordinates sel of the n
+        accumulated ones: rows/columns of the linear, quadratic (pairs
+        within sel) and constant terms, and the targets sel.
+        """
+        cols = [sel]
+        if self.use_quadratic:
+            K = np.zeros((n, n), dtype=int)
+            K[_triu(n)] = np.arange(n * (n + 1) // 2)
+            i, j = _triu(len(sel))
+            cols.append(n + K[sel[i], sel[j]])
+        cols.append([len(self.DtD) - 1])
+        idx = np.concatenate(cols)
+        return _EigenSolver(self.DtD[np.ix_(idx, idx)], self.DtR[np.ix_(idx, sel)],
+                            float(self.dRdR[sel].sum()))
+
+
+class _EigenSolver:
+    """
+    Tikhonov solutions of one regression for many λ from a single
+    eigendecomposition of DᵀD (same solve() interface as _NormalEquations).
+    """
+
+    def __init__(self, DtD: np.ndarray, DtR: np.ndarray, dRdR: float):
+        self.w, self.V = np.linalg.eigh(DtD)
+        self.B = self.V.T @ DtR
+        self.DtD, self.DtR, self.dRdR = DtD, DtR, dRdR
+
+    def solve(self, regularisation: float) -> np.ndarray:
+        return self.V @ (self.B / (self.w + regularisation)[:, None])
+
+    def residual(self, regularisation: float) -> float:
+        """‖D O − dR/dt‖² from the normal equations."""
+        O = self.solve(regularisation)
+        return float(np.sum(O * (self.DtD @ O)) - 2 * np.sum(O * self.DtR) + self.dRdR)
+
+
+class _EnergyCounter:
+    """Fraction ‖Φᵀx‖² / ‖x‖² of the snapshot energy captured per variable."""
+
+    def __init__(self, var_names: list[str]):
+        self.projected = {v: 0.0 for v in var_names}   # per reduced coordinate
+        self.total = {v: 0.0 for v in var_names}
+
+    def add(self, traj: dict, times: list[float], R: dict[str, np.ndarray]) -> None:
+        for v in self.projected:
+            self.projected[v] = self.projected[v] + np.einsum("ij,ij->j", R[v], R[v])
+            self.total[v] += sum(float(np.vdot(traj[t][v], traj[t][v])) for t in times)
+
+    def fractions(self, r: Optional[int] = None) -> dict[str, float]:
+        """Energy fractions of the leading r modes (all by default)."""
+        return {v: float(np.sum(self.projected[v][:r])) / self.total[v] if self.total[v] > 0 else 1.0
+                for v in self.projected}
+
+
+def _trajectories_digest(trajectories: list[dict[float, Frame]]) -> str:
+    h = new_hasher()
+    for traj in trajectories:
+        h.update(snapshot_digest(traj).encode())
+    return h.hexdigest()
+
+
+def _iter_frames(traj: TrajectoryStream) -> Iterator[tuple[float, dict[str, np.ndarray]]]:
+    if isinstance(traj, dict):
+        return ((t, traj[t]) for t in sorted(traj.keys()))
+    return iter(traj)
 
 
 # ---------------------------------------------------------------------------
@@ -114,6 +288,17 @@ class OpInfLLMBaseline:
         Tikhonov regularisation strength for the least-squares fit.
     integrate_method : str
         scipy solve_ivp method ('RK45', 'Radau', 'BDF').
+    pod_method : str
+        POD engine (baselines.pod): 'auto', 'svd', 'snapshots' or 'randomized'.
+    coupled : bool
+        Fit one joint ROM whose state concatenates every variable's POD
+        coordinates, so A and H carry cross-variable terms (u–v–w gating),
+        and integrate it in a single solve_ivp call. Otherwise each variable
+        has its own independent ROM.
+    cache_dir : str or Path, optional
+        If set, fit() stores the fitted model there as .npz (see save()),
+        keyed on a digest of the training data and the hyperparameters, and
+        later fits with the same key load it instead of refitting.
     """
 
     def __init__(
@@ -124,6 +309,9 @@ class OpInfLLMBaseline:
         llm_model: str = "qwen3:8b",
         regularisation: float = 1e-6,
         integrate_method: str = "RK45",
+        pod_method: str = "auto",
+        coupled: bool = False,
+        cache_dir: Optional[str | Path] = None,
     ):
         self.r = r
         self.use_quadratic = use_quadratic
@@ -131,19 +319,31 @@ class OpInfLLMBaseline:
         self.llm_model = llm_model
         self.regularisation = regularisation
         self.integrate_method = integrate_method
+        self.pod_method = pod_method
+        self.coupled = coupled
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
 
         # Fitted objects (set after fit())
         self.basis_: Optional[dict[str, np.ndarray]] = None   # {var: Φ (n, r)}
+        # Operators are keyed by ROM: the variable name, or "u+v+w" for the
+        # coupled ROM over those variables (see groups_)
         self.A_: Optional[dict[str, np.ndarray]] = None        # linear operators
         self.H_: Optional[dict[str, np.ndarray]] = None        # quadratic operators
         self.c_: Optional[dict[str, np.ndarray]] = None        # constant bias
         self.var_names_: Optional[list[str]] = None
+        self.groups_: Optional[dict[str, list[str]]] = None    # {ROM key: variables}
+        # Fraction of the training snapshot energy captured by each basis
+        self.pod_energy_: Optional[dict[str, float]] = None
+        self.data_digest_: Optional[str] = None
         self.metadata_: Optional[DatasetMetadata] = None
 
         # Performance
         self.fit_time_s_: float = 0.0
         self.fit_mem_mb_: float = 0.0
         self.n_train_snaps_: int = 0
+        # True when the last fit() loaded the model from cache_dir, in which
+        # case fit_time_s_ / fit_mem_mb_ measure the load, not a fit
+        self.fit_cached_: bool = False
 
     # ------------------------------------------------------------------
     # Phase 1 — Offline: fit
@@ -154,103 +354,372 @@ class OpInfLLMBaseline:
         trajectories: list[dict[float, dict[str, np.ndarray]]],
         metadata: DatasetMetadata,
         training_params: Optional[list[float]] = None,
+        data_digest: Optional[str] = None,
     ) -> "OpInfLLMBaseline":
         """
         Fit the OpInf ROM from training trajectories.
 
         trajectories : list of {t: {var: array}} dicts, one per sample.
         metadata     : DatasetMetadata for the dataset.
+        data_digest  : content digest of trajectories, if already known;
+                       only used for the fit cache (computed when omitted).
         """
-        self.metadata_ = metadata
-        self.var_names_ = metadata.var_names
-
         tracemalloc.start()
         t0 = time.perf_counter()
+        self.fit_cached_ = False
 
         # Optional LLM step: select operator terms
-        if self.use_llm:
-            terms = self._llm_select_terms(metadata)
-            self.use_quadratic = terms.get("quadratic", self.use_quadratic)
-            logger.info("LLM selected terms: %s", terms)
+        self._select_terms(metadata)
+
+        cache_path = None
+        if self.cache_dir is not None:
+            self.data_digest_ = data_digest or _trajectories_digest(trajectories)
+            cache_path = self.cache_dir / f"opinf_{self._cache_key()}.npz"
+            if self._load_cached(cache_path, trajectories):
+                self.fit_cached_ = True
+                self.fit_time_s_ = time.perf_counter() - t0
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.fit_mem_mb_ = peak / 1e6
+                logger.info("OpInf fit loaded from cache %s (%.2fs)", cache_path.name, self.fit_time_s_)
+                return self
+
+        times_per_traj = [sorted(traj.keys()) for traj in trajectories]
+        self.n_train_snaps_ = sum(len(times) for times in times_per_traj)
+
+        self._fit_basis(trajectories, times_per_traj)
+        normal, energy = self._accumulate(trajectories, times_per_traj)
+        self._solve_operators(normal)
+        self.pod_energy_ = energy.fractions()
 
-        # Aggregate all snapshots across trajectories
-        all_snaps: dict[str, list[np.ndarray]] = {v: [] for v in self.var_names_}
-        for traj in trajectories:
-            for t in sorted(traj.keys()):
-                for var in self.var_names_:
-                    all_snaps[var].append(traj[t][var].ravel())
+        self.fit_time_s_ = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.fit_mem_mb_ = peak / 1e6
 
-        self.n_train_snaps_ = len(list(all_snaps.values())[0])
+        logger.info(
+            "OpInf fit complete: %.2fs, %.1f MB, %d training snapshots",
+            self.fit_time_s_, self.fit_mem_mb_, self.n_train_snaps_,
+        )
+        if cache_path is not None:
+            self.save(cache_path)
+        return self
 
-        # Compute POD basis per variable
+    def fit_streaming(
+        self,
+        trajectories: Callable[[], Iterable[TrajectoryStream]],
+        metadata: DatasetMetadata,
+        block_frames: int = 32,
+    ) -> "OpInfLLMBaseline":
+        """
+        Fit from trajectories that are streamed rather than held in memory.
+
+        trajectories : zero-argument callable returning a fresh iterable of
+                       trajectories, each a {t: frame} dict or an iterable of
+                       (t, frame) pairs in time order (e.g. a generator over
+                       a loader). It is iterated twice: once for the POD
+                       basis, once for the operators.
+
+        Memory is O(n·(r + block_frames)) per variable plus the normal
+        equations, independent of the number of trajectories. The POD is
+        the incremental one (baselines.pod.IncrementalPOD), so pod_method
+        does not apply. For solver sinks, drive an OpInfStreamFitter directly.
+        """
+        tracemalloc.start()
+        fitter = OpInfStreamFitter(self, metadata, block_frames=block_frames)
+        for traj in trajectories():
+            for t, frame in _iter_frames(traj):
+                fitter(t, frame)
+            fitter.end_trajectory()
+        fitter.finish_basis()
+        for traj in trajectories():
+            for t, frame in _iter_frames(traj):
+                fitter(t, frame)
+            fitter.end_trajectory()
+        fitter.finish()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.fit_mem_mb_ = peak / 1e6
+        return self
+
+    def _fit_basis(self, trajectories: list[dict], times_per_traj: list[list[float]]) -> None:
+        """Compute the POD basis of each variable (self.r modes)."""
         self.basis_ = {}
         for var in self.var_names_:
-            X = np.stack(all_snaps[var], axis=1)  # (n_spatial, n_snaps)
-            U, s, _ = np.linalg.svd(X, full_matrices=False)
-            energy = np.cumsum(s ** 2) / np.sum(s ** 2)
-            r_actual = min(self.r, len(s))
+            n = trajectories[0][times_per_traj[0][0]][var].size
+            X = np.empty((n, self.n_train_snaps_))  # (n_spatial, n_snaps)
+            k = 0
+            for traj, times in zip(trajectories, times_per_traj):
+                for t in times:
+                    X[:, k] = traj[t][var].ravel()
+                    k += 1
+            method = (select_pod_method(*X.shape, self.r)
+                      if self.pod_method == "auto" else self.pod_method)
+            U, _, energy = pod_basis(X, self.r, method=method)
+            del X
             logger.info(
-                "  POD [%s]: r=%d retains %.4f%% energy",
-                var, r_actual, energy[r_actual - 1] * 100,
+                "  POD [%s]: r=%d retains %.4f%% energy (%s)",
+                var, U.shape[1], energy * 100, method,
             )
-            self.basis_[var] = U[:, :r_actual]
+            self.basis_[var] = U
 
-        # Learn operators per variable
-        self.A_ = {}
-        self.H_ = {}
-        self.c_ = {}
+    def _accumulate(
+        self,
+        trajectories: list[dict],
+        times_per_traj: list[list[float]],
+    ) -> tuple[dict[str, "_NormalEquations"], "_EnergyCounter"]:
+        """Project the trajectories; accumulate each ROM's normal equations and the POD energy."""
+        normal = {key: _NormalEquations(self.use_quadratic) for key in self.groups_}
+        energy = _EnergyCounter(self.var_names_)
+        for traj, times in zip(trajectories, times_per_traj):
+            R = {var: np.stack([self.basis_[var].T @ traj[t][var].ravel() for t in times])
+                 for var in self.var_names_}  # (T, r) each
+            energy.add(traj, times, R)
+            for key, group in self.groups_.items():
+                normal[key].add(times, np.concatenate([R[v] for v in group], axis=1))
+        return normal, energy
 
-        for var in self.var_names_:
-            Φ = self.basis_[var]
-            r = Φ.shape[1]
-
-            # Build reduced trajectories and time derivatives
-            R_list, dRdt_list = [], []
-            for traj in trajectories:
-                times = sorted(traj.keys())
-                R = np.stack([Φ.T @ traj[t][var].ravel() for t in times])  # (T, r)
-                # 2nd-order finite differences for time derivatives
-                dt_arr = np.diff(times)
-                dR = np.gradient(R, np.mean(dt_arr), axis=0)
-                R_list.append(R)
-                dRdt_list.append(dR)
-
-            R_all    = np.concatenate(R_list,    axis=0)  # (T_total, r)
-            dRdt_all = np.concatenate(dRdt_list, axis=0)  # (T_total, r)
-
-            # Build regression matrix [r, r⊗r, 1]
-            cols = [R_all]
-            if self.use_quadratic:
-                cols.append(_kron_quadratic_batch(R_all))
-            cols.append(np.ones((len(R_all), 1)))
-            D = np.concatenate(cols, axis=1)  # (T_total, n_terms)
+    # ------------------------------------------------------------------
+    # Hyperparameter sweep
+    # ------------------------------------------------------------------
 
-            # Tikhonov regularised least squares: min ‖D O - dR/dt‖ + λ‖O‖
-            n_terms = D.shape[1]
-            I = np.eye(n_terms) * self.regularisation
-            O, _, _, _ = lstsq(D.T @ D + I, D.T @ dRdt_all)  # (n_terms, r)
+    def sweep(
+        self,
+        trajectories: list[dict[float, dict[str, np.ndarray]]],
+        metadata: DatasetMetadata,
+        r_values: list[int],
+        regularisations: list[float],
+        validation: Optional[list[dict[float, dict[str, np.ndarray]]]] = None,
+        rtol: float = 1e-6,
+        atol: float = 1e-9,
+    ) -> list[dict]:
+        """
+        Score every (r, regularisation) pair at roughly the cost of one fit.
+
+        The POD basis, the projections and DᵀD / DᵀR are computed once at
+        max(r_values); a smaller r uses the leading sub-block (its reduced
+        coordinates are the leading coordinates of the larger basis). Each
+        sub-block is eigendecomposed once, DᵀD = V Λ Vᵀ, after which every
+        λ costs one solve O = V (Λ + λ)⁻¹ Vᵀ DᵀR.
+
+        Each row holds r, regularisation, the training residual
+        ‖D O − dR/dt‖ / ‖dR/dt‖ and, with validation trajectories, the
+        relative L2 error of predicting them from their first frame
+        (val_rel_l2, per variable val_rel_l2_<var>; inf if the ROM diverged).
+        Validation errors are evaluated in the reduced space,
+        ‖x − Φr̂‖² = ‖x‖² − ‖Φᵀx‖² + ‖Φᵀx − r̂‖², so no frame is
+        reconstructed (and predictions are not clipped).
+
+        The model is left fitted with the best setting (lowest val_rel_l2,
+        else lowest training residual).
+        """
+        t0 = time.perf_counter()
+        self._select_terms(metadata)
+        self.r = max(r_values)
+        times_per_traj = [sorted(traj.keys()) for traj in trajectories]
+        self.n_train_snaps_ = sum(len(times) for times in times_per_traj)
+        self._fit_basis(trajectories, times_per_traj)
+        normal, energy = self._accumulate(trajectories, times_per_traj)
+        full_basis = self.basis_
+
+        # Validation data projected once at full rank: (T, r_max) coordinates
+        # and ‖x‖² per frame for every variable
+        val = []
+        for traj in validation or []:
+            times = sorted(traj.keys())
+            P = {v: np.stack([full_basis[v].T @ traj[t][v].ravel() for t in times])
+                 for v in self.var_names_}
+            xx = {v: np.array([float(np.vdot(traj[t][v], traj[t][v])) for t in times])
+                  for v in self.var_names_}
+            val.append((times, P, xx))
+
+        rows, best, best_score = [], None, np.inf
+        for r in sorted(set(r_values)):
+            # Leading r modes of each variable, and their place in each ROM's state
+            self.basis_ = {v: Φ[:, :r] for v, Φ in full_basis.items()}
+            layouts = {}
+            for key, group in self.groups_.items():
+                sel, offset = [], 0
+                for v in group:
+                    sel.extend(range(offset, offset + min(r, full_basis[v].shape[1])))
+                    offset += full_basis[v].shape[1]
+                layouts[key] = (np.array(sel), offset)
+            subproblems = {key: normal[key].subproblem(*layouts[key]) for key in self.groups_}
+
+            for lam in regularisations:
+                self.regularisation = lam
+                self._solve_operators(subproblems)
+                residual = np.sqrt(sum(sub.residual(lam) for sub in subproblems.values())
+                                   / sum(sub.dRdR for sub in subproblems.values()))
+                row = {"r": r, "regularisation": lam, "train_residual": float(residual)}
+                if val:
+                    row.update(self._validation_error(val, r, rtol, atol))
+                    score = row["val_rel_l2"]
+                else:
+                    score = row["train_residual"]
+                rows.append(row)
+                if score < best_score or best is None:
+                    best_score = score
+                    best = (r, lam, dict(self.basis_), dict(self.A_), dict(self.H_), dict(self.c_))
+
+        self.r, self.regularisation, self.basis_, self.A_, self.H_, self.c_ = best
+        self.pod_energy_ = energy.fractions(self.r)
+        self.fit_time_s_ = time.perf_counter() - t0
+        self.fit_cached_ = False
+        logger.info(
+            "OpInf sweep: %d settings in %.2fs; best r=%d, regularisation=%g",
+            len(rows), self.fit_time_s_, self.r, self.regularisation,
+        )
+        return rows
+
+    def _validation_error(self, val: list, r: int, rtol: float, atol: float) -> dict[str, float]:
+        """Relative L2 error of the current operators on projected validation data."""
+        err = {v: 0.0 for v in self.var_names_}
+        ref = {v: 0.0 for v in self.var_names_}
+        for times, P, xx in val:
+            for key, group in self.groups_.items():
+                Z0 = np.concatenate([P[v][0, :r] for v in group])[None]
+                ts, Y, _ = self._integrate(key, Z0, times, rtol, atol)
+                offset = 0
+                for v in group:
+                    # A rank-deficient variable has fewer than r modes (as in Z0)
+                    Pr = P[v][:, :r]
+                    rv = Pr.shape[1]
+                    ref[v] += float(xx[v].sum())
+                    if len(ts) < len(times):
+                        err[v] = np.inf
+                    else:
+                        Ŷ = Y[offset: offset + rv, 0].T                     # (T, rv)
+                        err[v] += float(np.sum(xx[v]) - np.sum(Pr ** 2) + np.sum((Pr - Ŷ) ** 2))
+                    offset += rv
+        row = {f"val_rel_l2_{v}": float(np.sqrt(max(err[v], 0.0) / ref[v])) if ref[v] > 0 else np.nan
+               for v in self.var_names_}
+        row["val_rel_l2"] = float(np.mean([row[f"val_rel_l2_{v}"] for v in self.var_names_]))
+        return row
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str | Path) -> None:
+        """
+        Write the fitted model to a .npz file: bases and operators as
+        arrays, hyperparameters / metadata / data digest / POD energies as
+        a JSON header. The file is replaced atomically.
+        """
+        if self.basis_ is None:
+            raise RuntimeError("Call fit() before save().")
+        arrays = {f"basis/{v}": Φ for v, Φ in self.basis_.items()}
+        for key in self.groups_:
+            arrays[f"A/{key}"] = self.A_[key]
+            arrays[f"c/{key}"] = np.atleast_1d(self.c_[key])
+            if self.H_[key] is not None:
+                arrays[f"H/{key}"] = self.H_[key]
+        header = {
+            "format": _SAVE_FORMAT,
+            "params": {
+                "r": self.r, "use_quadratic": self.use_quadratic, "use_llm": self.use_llm,
+                "llm_model": self.llm_model, "regularisation": self.regularisation,
+                "integrate_method": self.integrate_method, "pod_method": self.pod_method,
+                "coupled": self.coupled,
+            },
+            "var_names": self.var_names_,
+            "groups": self.groups_,
+            "metadata": asdict(self.metadata_) if self.metadata_ is not None else None,
+            "data_digest": self.data_digest_,
+            "pod_energy": self.pod_energy_,
+            "n_train_snaps": self.n_train_snaps_,
+        }
+        arrays["header"] = np.frombuffer(json.dumps(header, default=str).encode(), dtype=np.uint8)
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "OpInfLLMBaseline":
+        """Model written by save(), ready for predict()."""
+        with np.load(path) as z:
+            header = json.loads(z["header"].tobytes())
+            if header.get("format") != _SAVE_FORMAT:
+                raise ValueError(f"{path}: unsupported OpInf model format {header.get('format')!r}")
+            model = cls(**header["params"])
+            model.var_names_ = header["var_names"]
+            model.groups_ = header["groups"]
+            model.basis_ = {v: z[f"basis/{v}"] for v in model.var_names_}
+            model.A_ = {k: z[f"A/{k}"] for k in model.groups_}
+            model.c_ = {k: z[f"c/{k}"] for k in model.groups_}
+            model.H_ = {k: z[f"H/{k}"] if f"H/{k}" in z else None for k in model.groups_}
+        if header["metadata"] is not None:
+            meta = header["metadata"]
+            model.metadata_ = DatasetMetadata(**{**meta, "spatial_shape": tuple(meta["spatial_shape"])})
+        model.data_digest_ = header["data_digest"]
+        model.pod_energy_ = header["pod_energy"]
+        model.n_train_snaps_ = header["n_train_snaps"]
+        return model
+
+    def _cache_key(self) -> str:
+        h = new_hasher()
+        h.update(json.dumps({
+            "format": _SAVE_FORMAT, "data": self.data_digest_, "vars": self.var_names_,
+            "r": self.r, "use_quadratic": self.use_quadratic,
+            "regularisation": self.regularisation, "pod_method": self.pod_method,
+            "coupled": self.coupled,
+        }, sort_keys=True).encode())
+        return h.hexdigest()
+
+    def _load_cached(self, path: Path, trajectories: list[dict]) -> bool:
+        """Adopt the cached fit at path if it exists and still fits the data."""
+        try:
+            cached = OpInfLLMBaseline.load(path)
+        except (FileNotFoundError, ValueError, KeyError, OSError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning("Ignoring unreadable OpInf cache %s (%s)", path, e)
+            return False
+        # Validation: the cached bases must capture the same energy of this
+        # data as at fit time (catches stale or corrupted entries)
+        energy = _EnergyCounter(self.var_names_)
+        for traj in trajectories:
+            times = sorted(traj.keys())
+            energy.add(traj, times, {v: np.stack([cached.basis_[v].T @ traj[t][v].ravel()
+                                                  for t in times]) for v in self.var_names_})
+        fractions = energy.fractions()
+        if not all(abs(fractions[v] - cached.pod_energy_[v]) <= 1e-8 for v in self.var_names_):
+            logger.warning("OpInf cache %s failed energy validation — refitting", path.name)
+            return False
+        for attr in ("basis_", "A_", "H_", "c_", "groups_", "pod_energy_", "n_train_snaps_"):
+            setattr(self, attr, getattr(cached, attr))
+        return True
+
+    def _select_terms(self, metadata: DatasetMetadata) -> None:
+        self.metadata_ = metadata
+        self.var_names_ = metadata.var_names
+        groups = [self.var_names_] if self.coupled else [[v] for v in self.var_names_]
+        self.groups_ = {"+".join(g): list(g) for g in groups}
+        if self.use_llm:
+            terms = self._llm_select_terms(metadata)
+            self.use_quadratic = terms.get("quadratic", self.use_quadratic)
+            logger.info("LLM selected terms: %s", terms)
+
+    def _solve_operators(self, normal: dict[str, "_NormalEquations"]) -> None:
+        self.A_, self.H_, self.c_ = {}, {}, {}
+        for key, group in self.groups_.items():
+            r = sum(self.basis_[v].shape[1] for v in group)
+            O = normal[key].solve(self.regularisation)  # (n_terms, r)
 
             # Unpack operators
-            self.A_[var] = O[:r, :].T                # (r, r)
+            self.A_[key] = O[:r, :].T                # (r, r)
             idx = r
             if self.use_quadratic:
                 n_quad = r * (r + 1) // 2
-                self.H_[var] = O[idx: idx + n_quad, :].T  # (r, n_quad)
+                self.H_[key] = O[idx: idx + n_quad, :].T  # (r, n_quad)
                 idx += n_quad
             else:
-                self.H_[var] = None
-            self.c_[var] = O[idx:, :].T.squeeze()    # (r,)
-
-        self.fit_time_s_ = time.perf_counter() - t0
-        _, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-        self.fit_mem_mb_ = peak / 1e6
-
-        logger.info(
-            "OpInf fit complete: %.2fs, %.1f MB, %d training snapshots",
-            self.fit_time_s_, self.fit_mem_mb_, self.n_train_snaps_,
-        )
-        return self
+                self.H_[key] = None
+            self.c_[key] = O[idx:, :].T.squeeze()    # (r,)
 
     # ------------------------------------------------------------------
     # Phase 2 — Online: predict
@@ -271,47 +740,169 @@ class OpInfLLMBaseline:
 
         Returns {t: {var: array of shape spatial_shape}}
         """
+        return self.predict_batch([ic], t_eval, rtol=rtol, atol=atol)[0]
+
+    def predict_batch(
+        self,
+        ics: Union[list[dict[str, np.ndarray]], dict[str, np.ndarray]],
+        t_eval: list[float],
+        sink: Optional[Callable[[int, float, Frame], None]] = None,
+        rtol: float = 1e-6,
+        atol: float = 1e-9,
+        block_bytes: int = 64 * 2**20,
+    ) -> list[dict[float, dict[str, np.ndarray]]]:
+        """
+        Predict B initial conditions together.
+
+        ics  : list of ic dicts as for predict(), or {var: (B, *spatial)}
+               arrays (the batched layout the reference solvers take)
+        sink : optional sink(b, t, frame) called with each reconstructed
+               frame instead of storing it (frames are fresh arrays)
+
+        Returns a list of B {t: {var: array}} dicts (empty with a sink).
+
+        The B reduced systems of each ROM are integrated as one ODE with a
+        vectorised (B, r) RHS, so they share step sizes and rtol/atol bound
+        the RMS error over the batch (see _integrate() for divergent samples). Frames are reconstructed with one GEMM
+        (Φ Y)ᵀ per variable and block of times (at most block_bytes each).
+        """
         if self.basis_ is None:
             raise RuntimeError("Call fit() before predict().")
 
-        t_span = (min(t_eval), max(t_eval))
-        predictions = {t: {} for t in t_eval}
+        if isinstance(ics, dict):
+            B = len(next(iter(ics.values())))
+            ic_arrays = {v: np.asarray(ics[v]).reshape(B, -1) for v in self.var_names_}
+            spatial_shape = {v: np.asarray(ics[v]).shape[1:] for v in self.var_names_}
+        else:
+            B = len(ics)
+            ic_arrays = {v: np.stack([ic[v].ravel() for ic in ics]) for v in self.var_names_}
+            spatial_shape = {v: ics[0][v].shape for v in self.var_names_}
+
+        # {var: (times, Y (r, B, T), reached (B, T))}
+        reduced: dict[str, tuple[list[float], np.ndarray, np.ndarray]] = {}
+        for key, group in self.groups_.items():
+            Z0 = np.concatenate([ic_arrays[v] @ self.basis_[v] for v in group], axis=1)  # (B, r)
+            times, Y, reached = self._integrate(key, Z0, t_eval, rtol, atol)
+            offset = 0
+            for var in group:
+                r = self.basis_[var].shape[1]
+                reduced[var] = (times, Y[offset: offset + r], reached)
+                offset += r
+
+        predictions = [{t: {} for t in t_eval} for _ in range(B)] if sink is None else []
+        all_times = sorted({t for times, _, _ in reduced.values() for t in times})
+        n_spatial = max(self.basis_[v].shape[0] for v in self.var_names_)
+        block = max(1, block_bytes // (8 * n_spatial * B))
+        for start in range(0, len(all_times), block):
+            chunk = all_times[start: start + block]
+            frames = {}  # var → ({t: column}, X (B·T_chunk, n), reached)
+            for var, (times, Y, reached) in reduced.items():
+                cols = [times.index(t) for t in chunk if t in times]
+                if not cols:
+                    continue
+                Φ = self.basis_[var]
+                # One GEMM for all samples and times; rows are whole frames
+                X = Y[:, :, cols].reshape(Φ.shape[1], -1).T @ Φ.T
+                np.clip(X, 0.0, 1.0, out=X)
+                frames[var] = ({times[i]: j for j, i in enumerate(cols)}, X, reached[:, cols])
+            for t in chunk:
+                for b in range(B):
+                    frame = {}
+                    for var, (column, X, reached) in frames.items():
+                        if t in column and reached[b, column[t]]:
+                            frame[var] = X[b * len(column) + column[t]].reshape(spatial_shape[var])
+                    if sink is not None:
+                        sink(b, t, frame)
+                    else:
+                        predictions[b][t].update(frame)
+        return predictions
 
-        for var in self.var_names_:
-            Φ = self.basis_[var]
-            A = self.A_[var]
-            H = self.H_[var]
-            c = self.c_[var]
-            r0 = Φ.T @ ic[var].ravel()
-
-            def rhs(t, r):
-                dr = A @ r + c
-                if H is not None:
-                    dr += H @ _kron_quadratic(r)
-                return dr
-
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                sol = solve_ivp(
-                    rhs,
-                    t_span,
-                    r0,
-                    method=self.integrate_method,
-                    t_eval=t_eval,
-                    rtol=rtol,
-                    atol=atol,
-                    dense_output=False,
-                )
-
-            spatial_shape = ic[var].shape
-            for i, t in enumerate(sol.t):
-                t_key = round(float(t), 6)
-                if t_key in predictions:
-                    u_full = Φ @ sol.y[:, i]
-                    u_full = np.clip(u_full, 0.0, 1.0)
-                    predictions[t_key][var] = u_full.reshape(spatial_shape)
+    def _integrate(
+        self,
+        key: str,
+        Z0: np.ndarray,
+        t_eval: list[float],
+        rtol: float,
+        atol: float,
+    ) -> tuple[list[float], np.ndarray, np.ndarray]:
+        """
+        Integrate ROM key from the B initial states Z0 (B, r) as one ODE.
 
-        return predictions
+        Returns (times reached that are in t_eval, Y (r, B, T), reached
+        (B, T) mask). If the joint solve stops early (one sample diverging
+        stalls the shared step size), each sample is re-integrated alone so
+        the others still reach the end, as with separate predict() calls.
+        """
+        A = self.A_[key]
+        H = self.H_[key]
+        c = self.c_[key]
+        B, n = Z0.shape
+
+        def rhs(t, y):
+            Z = y.reshape(-1, n)
+            dZ = Z @ A.T + c
+            if H is not None:
+                dZ += _kron_quadratic_batch(Z) @ H.T
+            return dZ.ravel()
+
+        # Implicit methods get the analytic Jacobian instead of B·r finite
+        # differences of rhs per Jacobian evaluation
+        jac = None
+        if self.integrate_method in _IMPLICIT_METHODS:
+            jac_one = self._jacobian_fn(key)
+            if B == 1:
+                jac = jac_one
+            elif callable(jac_one):
+                jac = lambda t, y: sparse.block_diag([jac_one(t, z) for z in y.reshape(B, n)], format="csc")
+            else:
+                jac = sparse.block_diag([jac_one] * B, format="csc")
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            sol = solve_ivp(
+                rhs,
+                (min(t_eval), max(t_eval)),
+                Z0.ravel(),
+                method=self.integrate_method,
+                t_eval=t_eval,
+                rtol=rtol,
+                atol=atol,
+                dense_output=False,
+                jac=jac,
+            )
+
+        wanted = set(t_eval)
+        if sol.success or B == 1:
+            keep = [i for i, t in enumerate(sol.t) if round(float(t), 6) in wanted]
+            times = [round(float(sol.t[i]), 6) for i in keep]
+            Y = sol.y[:, keep].reshape(B, n, len(keep)).transpose(1, 0, 2)
+            return times, Y, np.ones((B, len(keep)), dtype=bool)
+
+        parts = [self._integrate(key, Z0[b: b + 1], t_eval, rtol, atol) for b in range(B)]
+        times = sorted({t for part_times, _, _ in parts for t in part_times})
+        Y = np.full((n, B, len(times)), np.nan)
+        reached = np.zeros((B, len(times)), dtype=bool)
+        for b, (part_times, part_Y, _) in enumerate(parts):
+            cols = [times.index(t) for t in part_times]
+            Y[:, b, cols] = part_Y[:, 0]
+            reached[b, cols] = True
+        return times, Y, reached
+
+    def jacobian(self, key: str, r: np.ndarray) -> np.ndarray:
+        """
+        Jacobian of the reduced RHS of ROM key at state r:
+        A + ∂(H (r⊗r))/∂r = A + S·r, with S the symmetrised H tensor.
+        """
+        jac = self._jacobian_fn(key)
+        return jac(0.0, r) if callable(jac) else jac
+
+    def _jacobian_fn(self, key: str) -> Union[np.ndarray, Callable[[float, np.ndarray], np.ndarray]]:
+        A, H = self.A_[key], self.H_[key]
+        if H is None:
+            return A  # linear ROM: constant Jacobian
+        n = len(A)
+        S = _quadratic_jacobian_tensor(H, n).reshape(n * n, n)
+        return lambda t, r: A + (S @ r).reshape(n, n)
 
     # ------------------------------------------------------------------
     # LLM operator term selection
@@ -364,6 +955,8 @@ Set "constant" to false only if there is no forcing/bias term.
         target_param: float,
         trained_models: list["OpInfLLMBaseline"],
         poly_degree: int = 2,
+        interpolant: str = "poly",
+        basis: str = "reference",
     ) -> "OpInfLLMBaseline":
         """
         Given OpInf models trained at each value in training_params,
@@ -371,52 +964,180 @@ Set "constant" to false only if there is no forcing/bias term.
 
         Returns a new OpInfLLMBaseline with extrapolated operators.
         This implements the parametric extension from the OpInf-LLM paper.
+
+        interpolant : "poly" (least squares of degree poly_degree),
+                      "lagrange" (exact polynomial through all points) or
+                      "rbf" (scipy RBFInterpolator, thin-plate spline)
+        basis       : "reference" keeps this model's basis and uses the
+                      operators as fitted; "grassmann" first rotates every
+                      model's operators into coordinates aligned with this
+                      model's basis, then interpolates the bases themselves
+                      on the Grassmann manifold with the same interpolant.
+
+        Every operator entry is interpolated at once: one least-squares
+        solve (or RBF fit) over the stacked (n_params, …) operator arrays.
         """
+        if interpolant not in _INTERPOLANTS:
+            raise ValueError(f"Unknown interpolant {interpolant!r}; expected one of {_INTERPOLANTS}")
+        if basis not in ("reference", "grassmann"):
+            raise ValueError(f"Unknown basis interpolation {basis!r}")
+
         new_model = OpInfLLMBaseline(
             r=self.r,
             use_quadratic=self.use_quadratic,
             regularisation=self.regularisation,
             integrate_method=self.integrate_method,
+            pod_method=self.pod_method,
+            coupled=self.coupled,
         )
         new_model.basis_ = self.basis_
         new_model.var_names_ = self.var_names_
+        new_model.groups_ = self.groups_
         new_model.metadata_ = self.metadata_
         new_model.A_ = {}
         new_model.H_ = {}
         new_model.c_ = {}
 
-        xi = np.array(training_params)
-        xi_tgt = np.array([target_param])
-
-        for var in self.var_names_:
-            A_vals = np.stack([m.A_[var] for m in trained_models])   # (n_params, r, r)
-            c_vals = np.stack([m.c_[var] for m in trained_models])   # (n_params, r)
-
-            # Fit polynomial per entry and evaluate at target_param
-            A_new = np.zeros_like(A_vals[0])
-            c_new = np.zeros_like(c_vals[0])
-
-            for i in range(A_vals.shape[1]):
-                for j in range(A_vals.shape[2]):
-                    coeffs = np.polyfit(xi, A_vals[:, i, j], deg=poly_degree)
-                    A_new[i, j] = np.polyval(coeffs, target_param)
-
-            for i in range(c_vals.shape[1]):
-                coeffs = np.polyfit(xi, c_vals[:, i], deg=poly_degree)
-                c_new[i] = np.polyval(coeffs, target_param)
-
-            new_model.A_[var] = A_new
-            new_model.c_[var] = c_new
-
-            if self.use_quadratic and self.H_[var] is not None:
-                H_vals = np.stack([m.H_[var] for m in trained_models])
-                H_new = np.zeros_like(H_vals[0])
-                for i in range(H_vals.shape[1]):
-                    for j in range(H_vals.shape[2]):
-                        coeffs = np.polyfit(xi, H_vals[:, i, j], deg=poly_degree)
-                        H_new[i, j] = np.polyval(coeffs, target_param)
-                new_model.H_[var] = H_new
+        xi = np.array(training_params, dtype=float)
+
+        def interpolate(vals: list[np.ndarray]) -> np.ndarray:
+            return _interpolate_stack(xi, np.stack(vals), target_param, interpolant, poly_degree)
+
+        # Change of reduced coordinates per model (identity for "reference")
+        Q = [{v: np.eye(self.basis_[v].shape[1]) for v in self.var_names_} for _ in trained_models]
+        if basis == "grassmann":
+            new_model.basis_ = {}
+            for var in self.var_names_:
+                Φ0 = self.basis_[var]
+                Q_var = [align_basis(m.basis_[var], Φ0) for m in trained_models]
+                for q, q_var in zip(Q, Q_var):
+                    q[var] = q_var
+                Γ = interpolate([grassmann_log(Φ0, m.basis_[var] @ q)
+                                 for m, q in zip(trained_models, Q_var)])
+                new_model.basis_[var] = grassmann_exp(Φ0, Γ)
+
+        for key, group in self.groups_.items():
+            ops = [_change_coordinates(m.A_[key], m.H_[key], m.c_[key],
+                                       block_diag(*[q[v] for v in group]))
+                   for m, q in zip(trained_models, Q)]
+            new_model.A_[key] = interpolate([A for A, _, _ in ops])
+            new_model.c_[key] = interpolate([c for _, _, c in ops])
+            if self.use_quadratic and self.H_[key] is not None:
+                new_model.H_[key] = interpolate([H for _, H, _ in ops])
             else:
-                new_model.H_[var] = None
+                new_model.H_[key] = None
 
         return new_model
+
+
+# ---------------------------------------------------------------------------
+# Streaming fit
+# ---------------------------------------------------------------------------
+
+class OpInfStreamFitter:
+    """
+    Two-pass OpInf fit fed one frame at a time, usable as a solver sink.
+
+    Pass 1 builds an incremental POD basis, pass 2 projects each frame and
+    accumulates the normal equations. The trajectories must be replayed in
+    pass 2 (the reduced coordinates depend on the final basis); call
+    end_trajectory() after each one. The initial condition is not sent by
+    solver sinks, so feed it first. Memory is not traced here (solvers run
+    their own tracemalloc); fit_streaming() records it.
+
+        fitter = OpInfStreamFitter(model, meta)
+        for pass_ in range(2):
+            for ic in train_ics:
+                fitter(0.0, ic)
+                FentonKarmaSolver().run(ic, t_end, times, sink=fitter)
+                fitter.end_trajectory()
+            if pass_ == 0:
+                fitter.finish_basis()
+        fitter.finish()                 # returns the fitted model
+    """
+
+    def __init__(
+        self,
+        model: OpInfLLMBaseline,
+        metadata: DatasetMetadata,
+        block_frames: int = 32,
+        rank_buffer: int = 10,
+    ):
+        self.model = model
+        self.block_frames = block_frames
+        self.rank_buffer = rank_buffer
+        model._select_terms(metadata)
+        self._pod: dict[str, IncrementalPOD] = {}
+        self._block: dict[str, list[np.ndarray]] = {v: [] for v in model.var_names_}
+        self._normal: Optional[dict[str, _NormalEquations]] = None
+        self._times: list[float] = []
+        self._R: dict[str, list[np.ndarray]] = {v: [] for v in model.var_names_}
+        self.n_snaps = 0
+        self._t0 = time.perf_counter()
+
+    def __call__(self, t: float, frame: Frame) -> None:
+        if self._normal is None:
+            self.n_snaps += 1
+            for var in self.model.var_names_:
+                self._block[var].append(frame[var].ravel())
+                if len(self._block[var]) >= self.block_frames:
+                    self._flush(var)
+        else:
+            self._times.append(t)
+            for var in self.model.var_names_:
+                x = frame[var].ravel()
+                self._R[var].append(self.model.basis_[var].T @ x)
+                self._energy.total[var] += float(np.vdot(x, x))
+
+    def _flush(self, var: str) -> None:
+        if not self._block[var]:
+            return
+        block = np.stack(self._block[var], axis=1)
+        self._block[var] = []
+        if var not in self._pod:
+            self._pod[var] = IncrementalPOD(len(block), self.model.r + self.rank_buffer)
+        self._pod[var].update(block)
+
+    def end_trajectory(self) -> None:
+        if self._normal is None:
+            return
+        if self._times:
+            for var in self.model.var_names_:
+                R = np.stack(self._R[var])
+                self._energy.projected[var] = self._energy.projected[var] + np.einsum("ij,ij->j", R, R)
+            for key, group in self.model.groups_.items():
+                R = np.concatenate([np.stack(self._R[v]) for v in group], axis=1)
+                self._normal[key].add(self._times, R)
+            self._R = {v: [] for v in self.model.var_names_}
+        self._times = []
+
+    def finish_basis(self) -> None:
+        """End pass 1: fix the POD basis and start accumulating operators."""
+        model = self.model
+        model.basis_ = {}
+        for var in model.var_names_:
+            self._flush(var)
+            U, _, energy = self._pod[var].basis(model.r)
+            logger.info("  POD [%s]: r=%d retains %.4f%% energy (incremental)",
+                        var, U.shape[1], energy * 100)
+            model.basis_[var] = U
+        self._pod = {}
+        self._normal = {key: _NormalEquations(model.use_quadratic) for key in model.groups_}
+        self._energy = _EnergyCounter(model.var_names_)
+
+    def finish(self) -> OpInfLLMBaseline:
+        """End pass 2: solve for the operators and return the fitted model."""
+        if self._normal is None:
+            raise RuntimeError("Call finish_basis() after the first pass.")
+        self.end_trajectory()
+        model = self.model
+        model._solve_operators(self._normal)
+        model.pod_energy_ = self._energy.fractions()
+        model.n_train_snaps_ = self.n_snaps
+        model.fit_time_s_ = time.perf_counter() - self._t0
+        model.fit_cached_ = False
+        logger.info(
+            "OpInf streaming fit complete: %.2fs, %d training snapshots",
+            model.fit_time_s_, model.n_train_snaps_,
+        )
+        return model
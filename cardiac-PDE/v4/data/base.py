@@ -7,10 +7,15 @@ Use get_data_source() to get the right one by name.
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Optional
+from dataclasses import dataclass, field, replace
+from typing import Optional, Union
 import numpy as np
 
+# Region of interest for spatial reads: one slice per spatial axis, e.g.
+# (slice(None, None, 4), slice(None, None, 4)) for a 4× downsample or
+# (slice(192, 320), slice(192, 320)) for a crop. None means the full field.
+SpatialIndex = Optional[Union[slice, tuple[slice, ...]]]
+
 
 @dataclass
 class DatasetMetadata:
@@ -25,6 +30,115 @@ class DatasetMetadata:
     dx: float
     domain_size: float                 # e.g. 20.0
     params: dict = field(default_factory=dict)  # model parameters
+    n_samples: int = 1                 # trajectories available (sample_idx range)
+
+    def spatial_view(self, spatial: SpatialIndex) -> "DatasetMetadata":
+        """
+        Metadata describing the arrays returned for a given spatial index.
+        spatial_shape is the sliced shape; dx is scaled by the stride of the
+        first axis (strides are assumed uniform across axes).
+        """
+        if spatial is None:
+            return self
+        sl = normalize_spatial(spatial, len(self.spatial_shape))
+        shape = tuple(len(range(*s.indices(n))) for s, n in zip(sl, self.spatial_shape))
+        return replace(self, spatial_shape=shape, dx=self.dx * (sl[0].step or 1))
+
+
+def normalize_spatial(spatial: SpatialIndex, ndim: int) -> tuple[slice, ...]:
+    """
+    Expand a spatial index to exactly one slice per spatial axis.
+    Only plain slices with positive steps are accepted, since those map
+    directly onto HDF5 hyperslabs and memmap views without a copy.
+    """
+    if spatial is None:
+        return (slice(None),) * ndim
+    if isinstance(spatial, slice):
+        spatial = (spatial,)
+    spatial = tuple(spatial)
+    if len(spatial) > ndim:
+        raise ValueError(f"spatial index has {len(spatial)} axes, data has {ndim}")
+    for s in spatial:
+        if not isinstance(s, slice):
+            raise TypeError(f"spatial index entries must be slices, got {type(s).__name__}")
+        if s.step is not None and s.step <= 0:
+            raise ValueError("spatial slices must have a positive step")
+    return spatial + (slice(None),) * (ndim - len(spatial))
+
+
+def strided(step: int, ndim: int = 2) -> tuple[slice, ...]:
+    """Spatial index for a uniform step× downsample, e.g. strided(4)."""
+    return (slice(None, None, step),) * ndim
+
+
+def _as_slice(indices: np.ndarray):
+    """Sorted unique indices as a slice if they are evenly spaced, else a list."""
+    if len(indices) == 1:
+        return slice(int(indices[0]), int(indices[0]) + 1)
+    steps = np.diff(indices)
+    if np.all(steps == steps[0]):
+        return slice(int(indices[0]), int(indices[-1]) + 1, int(steps[0]))
+    return indices.tolist()
+
+
+def read_sample_time_block(
+    dset,
+    sample_indices: list[int],
+    time_indices: list[int],
+    tail: tuple = (),
+) -> np.ndarray:
+    """
+    Read dset[sample_indices, time_indices, *tail] from an [N, T, ...] array
+    (HDF5 dataset, memmap or ndarray) as a [B, T, ...] block.
+
+    HDF5 only allows one increasing index list per selection, so indices are
+    de-duplicated and sorted (which is also the on-disk order), evenly spaced
+    runs become strided hyperslabs, and the block is re-gathered into the
+    requested order afterwards.
+    """
+    uniq_s, inv_s = np.unique(np.asarray(sample_indices), return_inverse=True)
+    uniq_t, inv_t = np.unique(np.asarray(time_indices), return_inverse=True)
+    s_sel, t_sel = _as_slice(uniq_s), _as_slice(uniq_t)
+    if isinstance(s_sel, slice) or isinstance(t_sel, slice):
+        block = dset[(s_sel, t_sel) + tuple(tail)]
+    else:
+        block = np.stack([dset[(int(n), t_sel) + tuple(tail)] for n in uniq_s])
+    block = np.asarray(block)
+    if len(uniq_s) != len(sample_indices) or np.any(np.diff(inv_s) != 1):
+        block = block[inv_s]
+    if len(uniq_t) != len(time_indices) or np.any(np.diff(inv_t) != 1):
+        block = block[:, inv_t]
+    return block
+
+
+def new_hasher():
+    """
+    Fast non-cryptographic hasher for content digests: xxh3-128 if the
+    optional xxhash package is installed, else blake2b-128.
+    """
+    try:
+        import xxhash
+        return xxhash.xxh3_128()
+    except ImportError:
+        import hashlib
+        return hashlib.blake2b(digest_size=16)
+
+
+def update_digest(h, t: float, frame: dict[str, np.ndarray]) -> None:
+    """Feed one snapshot (time, variables in sorted order) into hasher h."""
+    h.update(repr(round(float(t), 6)).encode())
+    for v in sorted(frame):
+        a = np.ascontiguousarray(frame[v])
+        h.update(f"{v}|{a.dtype.str}|{a.shape}".encode())
+        h.update(memoryview(a).cast("B"))
+
+
+def snapshot_digest(snaps: dict[float, dict[str, np.ndarray]]) -> str:
+    """Content digest of {t: {var: array}} snapshots (times in sorted order)."""
+    h = new_hasher()
+    for t in sorted(snaps):
+        update_digest(h, t, snaps[t])
+    return h.hexdigest()
 
 
 class DataSource(ABC):
@@ -33,6 +147,10 @@ class DataSource(ABC):
 
     Subclasses must implement load_ic(), load_snapshots(), and get_metadata().
     All spatial arrays have shape (H, W) for 2D or (N,) for 1D.
+
+    load_ic() and load_snapshots() accept an optional `spatial` index (see
+    SpatialIndex). Loaders push it down into the underlying read so only
+    the selected region / stride is read from disk.
     """
 
     @abstractmethod
@@ -40,10 +158,14 @@ class DataSource(ABC):
         """Return dataset metadata."""
 
     @abstractmethod
-    def load_ic(self, sample_idx: int = 0) -> dict[str, np.ndarray]:
+    def load_ic(
+        self,
+        sample_idx: int = 0,
+        spatial: SpatialIndex = None,
+    ) -> dict[str, np.ndarray]:
         """
         Load initial conditions for one sample.
-        Returns {var_name: array of shape spatial_shape}.
+        Returns {var_name: array of shape spatial_shape} (sliced by spatial).
         """
 
     @abstractmethod
@@ -51,6 +173,7 @@ class DataSource(ABC):
         self,
         sample_idx: int = 0,
         time_indices: Optional[list[int]] = None,
+        spatial: SpatialIndex = None,
     ) -> dict[float, dict[str, np.ndarray]]:
         """
         Load ground-truth snapshots.
@@ -58,23 +181,56 @@ class DataSource(ABC):
         If time_indices is None, load all available snapshots.
         """
 
+    def load_batch(
+        self,
+        sample_indices: list[int],
+        time_indices: Optional[list[int]] = None,
+        spatial: SpatialIndex = None,
+    ) -> np.ndarray:
+        """
+        Load several samples at once as one array of shape
+        [B, T, V, *spatial] (variables in metadata.var_names order).
+
+        This default stacks load_snapshots() results; loaders backed by
+        HDF5 / memmaps override it with a single sorted block read.
+        """
+        meta = self.get_metadata()
+        if time_indices is None:
+            time_indices = list(range(meta.n_time_steps))
+        batch = []
+        for idx in sample_indices:
+            snaps = self.load_snapshots(sample_idx=idx, time_indices=time_indices, spatial=spatial)
+            batch.append(np.stack([
+                np.stack([snaps[t][v] for v in meta.var_names]) for t in snaps
+            ]))
+        return np.stack(batch)
+
+    def snapshot_digest(self, sample_idx: int = 0) -> Optional[str]:
+        """
+        Stored snapshot_digest() of load_snapshots(sample_idx) (all times,
+        full grid), if the source keeps one; None means hash the loaded
+        arrays instead.
+        """
+        return None
+
     def load_training_trajectories(
         self,
         sample_indices: list[int],
         subsample_t: int = 1,
+        spatial: SpatialIndex = None,
     ) -> tuple[list[dict], DatasetMetadata]:
         """
         Load multiple trajectories for OpInf training.
-        Returns (list of {t: {var: array}}, metadata).
+        Returns (list of {t: {var: array}}, metadata); the metadata reflects
+        the spatial index so downstream code sees the sliced grid.
         """
-        trajectories = []
-        for idx in sample_indices:
-            snaps = self.load_snapshots(sample_idx=idx)
-            if subsample_t > 1:
-                times = sorted(snaps.keys())
-                snaps = {t: snaps[t] for i, t in enumerate(times) if i % subsample_t == 0}
-            trajectories.append(snaps)
-        return trajectories, self.get_metadata()
+        meta = self.get_metadata()
+        time_indices = list(range(0, meta.n_time_steps, subsample_t))
+        trajectories = [
+            self.load_snapshots(sample_idx=idx, time_indices=time_indices, spatial=spatial)
+            for idx in sample_indices
+        ]
+        return trajectories, meta.spatial_view(spatial)
 
 
 # ---------------------------------------------------------------------------
@@ -87,6 +243,7 @@ def get_data_source(name: str, **kwargs) -> DataSource:
         "pdebench_2d_rd"   — PDEBench 2D Reaction-Diffusion (FitzHugh-Nagumo)
         "pdebench_1d_burgers" — PDEBench 1D Burgers
         "fk"               — Fenton-Karma ground truth (local CSV/NPZ)
+        "store"            — Unified chunked HDF5 store (data/convert_to_store.py)
         "custom"           — Custom data source (extend CustomLoader)
     """
     if name == "pdebench_2d_rd":
@@ -98,11 +255,14 @@ def get_data_source(name: str, **kwargs) -> DataSource:
     elif name == "fk":
         from data.fk_loader import FKDataLoader
         return FKDataLoader(**kwargs)
+    elif name == "store":
+        from data.store_loader import StoreLoader
+        return StoreLoader(**kwargs)
     elif name == "custom":
         from data.custom_loader import CustomLoader
         return CustomLoader(**kwargs)
     else:
         raise ValueError(
             f"Unknown data source '{name}'. "
-            f"Choose from: pdebench_2d_rd, pdebench_1d_burgers, fk, custom"
+            f"Choose from: pdebench_2d_rd, pdebench_1d_burgers, fk, store, custom"
         )
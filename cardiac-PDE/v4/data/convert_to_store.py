@@ -0,0 +1,184 @@
+"""
+data/convert_to_store.py — Convert any data source into the unified store.
+
+Sources
+-------
+  fk                   FK ground truth (NPZ/CSV) via FKDataLoader
+  pdebench_2d_rd       PDEBench 2D reaction-diffusion via PDEBench2DRDLoader
+  pdebench_1d_burgers  PDEBench 1D Burgers via PDEBench1DBurgersLoader
+  v6                   v6 per-IC files ./data/{pde}/train|test/IC_i + solution_i
+                       (.bin or .csv), stored as T=2 frames (t=0 and t_end)
+
+Usage
+-----
+  python data/convert_to_store.py --source fk --out data/store/fk.h5
+  python data/convert_to_store.py --source pdebench_2d_rd \\
+      --data-dir ./data/raw/pdebench --samples 0 1 2 3 --out data/store/pdebench_2d_rd.h5
+  python data/convert_to_store.py --source v6 \\
+      --data-dir ../v6/data/twoD_reaction_diffusion --var-names u v --t-end 5.0 \\
+      --out data/store/v6_2d_rd.h5
+
+Then evaluate with:  python pipeline/eval_pipeline.py --data store --data-dir data/store --store-name fk
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+# ── path setup ──────────────────────────────────────────────────────────────
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT.parent / "v6"))  # v6 field reader (field_io)
+
+from data.base import DataSource, DatasetMetadata, SpatialIndex, get_data_source, normalize_spatial
+from data.store_loader import write_store
+from field_io import read_field_with_shape
+
+
+class V6FieldSource(DataSource):
+    """
+    Read-only DataSource over a v6 data directory (used for conversion).
+
+    Each IC_i / solution_i pair becomes one sample with two snapshots at
+    t=0 and t=t_end. Variables are the first len(var_names) RGBA channels.
+    For 1D problems (rows tiled across the texture) set one_d=True to keep
+    a single row.
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        var_names: list[str],
+        t_end: float,
+        split: str = "all",
+        domain_size: float = 1.0,
+        one_d: bool = False,
+    ):
+        self.data_dir = Path(data_dir)
+        self.var_names = var_names
+        self.t_end = t_end
+        self.domain_size = domain_size
+        self.one_d = one_d
+        splits = ["train", "test"] if split == "all" else [split]
+        stems: dict[int, Path] = {}
+        for sp in splits:
+            for p in sorted((self.data_dir / sp).glob("IC_*")):
+                m = re.fullmatch(r"IC_(\d+)\.(bin|csv)", p.name)
+                # Prefer the binary file when both formats exist
+                if m and (int(m.group(1)) not in stems or p.suffix == ".bin"):
+                    stems[int(m.group(1))] = p
+        if not stems:
+            raise FileNotFoundError(f"No IC_* files under {self.data_dir}/{{train,test}}")
+        self._ic_files = [stems[i] for i in sorted(stems)]
+        self._shape: Optional[tuple[int, ...]] = None
+
+    def _frame(self, path: Path) -> dict[str, np.ndarray]:
+        width, height, values = read_field_with_shape(path)
+        rgba = values.reshape(height, width, 4)
+        if self.one_d:
+            rgba = rgba[:1]
+        frame = {v: np.asarray(rgba[..., i], dtype=np.float64) for i, v in enumerate(self.var_names)}
+        if self.one_d:
+            frame = {v: a[0] for v, a in frame.items()}
+        self._shape = next(iter(frame.values())).shape
+        return frame
+
+    def _solution_file(self, ic_file: Path) -> Path:
+        sol = ic_file.with_name(ic_file.name.replace("IC_", "solution_", 1))
+        if not sol.exists():
+            sol = sol.with_suffix(".csv" if sol.suffix == ".bin" else ".bin")
+        return sol
+
+    def get_metadata(self) -> DatasetMetadata:
+        if self._shape is None:
+            self._frame(self._ic_files[0])
+        return DatasetMetadata(
+            name=f"v6_{self.data_dir.name}",
+            n_vars=len(self.var_names),
+            var_names=list(self.var_names),
+            spatial_shape=self._shape,
+            n_time_steps=2,
+            t_start=0.0,
+            t_end=self.t_end,
+            dt=self.t_end,
+            dx=self.domain_size / self._shape[-1],
+            domain_size=self.domain_size,
+            n_samples=len(self._ic_files),
+        )
+
+    def load_ic(self, sample_idx: int = 0, spatial: SpatialIndex = None) -> dict[str, np.ndarray]:
+        frame = self._frame(self._ic_files[sample_idx])
+        sl = normalize_spatial(spatial, len(self._shape))
+        return {v: a[sl] for v, a in frame.items()}
+
+    def load_snapshots(
+        self,
+        sample_idx: int = 0,
+        time_indices: Optional[list[int]] = None,
+        spatial: SpatialIndex = None,
+    ) -> dict[float, dict[str, np.ndarray]]:
+        ic_file = self._ic_files[sample_idx]
+        files = {0.0: ic_file, round(self.t_end, 6): self._solution_file(ic_file)}
+        times = sorted(files)
+        indices = time_indices if time_indices is not None else range(len(times))
+        out = {}
+        for ti in indices:
+            frame = self._frame(files[times[ti]])
+            sl = normalize_spatial(spatial, len(self._shape))
+            out[times[ti]] = {v: a[sl] for v, a in frame.items()}
+        return out
+
+
+def build_args():
+    p = argparse.ArgumentParser(
+        description="Convert a data source into the unified chunked HDF5 store",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    p.add_argument("--source", required=True,
+                   choices=["fk", "pdebench_2d_rd", "pdebench_1d_burgers", "v6"])
+    p.add_argument("--out", required=True, help="Output store file (.h5)")
+    p.add_argument("--data-dir", default=None, help="Source data directory")
+    p.add_argument("--samples", type=int, nargs="+", default=None,
+                   help="Sample indices to convert (default: all)")
+    p.add_argument("--compression", type=int, default=4, help="gzip level 0-9")
+    # FK / PDEBench options
+    p.add_argument("--tau-d", type=float, default=0.5714, help="FK tau_d")
+    p.add_argument("--nu", type=float, default=0.01, help="Burgers viscosity")
+    # v6 options
+    p.add_argument("--var-names", nargs="+", default=["u"], help="v6 channel names")
+    p.add_argument("--t-end", type=float, default=1.0, help="v6 solution time")
+    p.add_argument("--split", default="all", choices=["train", "test", "all"])
+    p.add_argument("--domain-size", type=float, default=1.0)
+    p.add_argument("--one-d", action="store_true", help="v6 data is 1D (rows tiled)")
+    return p.parse_args()
+
+
+def main():
+    args = build_args()
+    if args.source == "v6":
+        src = V6FieldSource(
+            args.data_dir, args.var_names, args.t_end,
+            split=args.split, domain_size=args.domain_size, one_d=args.one_d,
+        )
+    else:
+        kwargs = {"data_dir": args.data_dir} if args.data_dir else {}
+        if args.source == "fk":
+            kwargs["tau_d"] = args.tau_d
+        elif args.source == "pdebench_1d_burgers":
+            kwargs["nu"] = args.nu
+        src = get_data_source(args.source, **kwargs)
+
+    path = write_store(args.out, src, sample_indices=args.samples,
+                       compression_level=args.compression, source_label=args.source)
+    meta = src.get_metadata()
+    print(f"Wrote {path}  ({meta.name}, vars={meta.var_names}, shape={meta.spatial_shape})")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,7 @@ from typing import Optional
 
 import numpy as np
 
-from data.base import DataSource, DatasetMetadata
+from data.base import DataSource, DatasetMetadata, SpatialIndex, normalize_spatial
 
 
 class CustomLoader(DataSource):
@@ -54,21 +54,29 @@ class CustomLoader(DataSource):
     def get_metadata(self) -> DatasetMetadata:
         return self.METADATA
 
-    def load_ic(self, sample_idx: int = 0) -> dict[str, np.ndarray]:
+    def load_ic(
+        self,
+        sample_idx: int = 0,
+        spatial: SpatialIndex = None,
+    ) -> dict[str, np.ndarray]:
         """
         Return initial conditions for sample_idx.
         Output: {var_name: np.ndarray of shape spatial_shape}
+        Apply `spatial` (see data.base.normalize_spatial) inside the read
+        where the format allows it (HDF5 hyperslab, np.load mmap_mode="r").
         """
         # TODO: implement
         # Example — load from numpy file:
-        #   data = np.load(self.data_dir / f"ic_{sample_idx:04d}.npy")
-        #   return {"u": data[0], "v": data[1]}
+        #   sl = normalize_spatial(spatial, 2)
+        #   data = np.load(self.data_dir / f"ic_{sample_idx:04d}.npy", mmap_mode="r")
+        #   return {"u": np.array(data[0][sl]), "v": np.array(data[1][sl])}
         raise NotImplementedError("Implement load_ic() in CustomLoader")
 
     def load_snapshots(
         self,
         sample_idx: int = 0,
         time_indices: Optional[list[int]] = None,
+        spatial: SpatialIndex = None,
     ) -> dict[float, dict[str, np.ndarray]]:
         """
         Return ground-truth snapshots.
@@ -77,9 +85,10 @@ class CustomLoader(DataSource):
         # TODO: implement
         # Example — load from HDF5:
         #   import h5py
+        #   sy, sx = normalize_spatial(spatial, 2)
         #   with h5py.File(self.data_dir / f"sample_{sample_idx:04d}.h5") as f:
-        #       u_all = f["u"][:]   # shape (T, H, W)
-        #       v_all = f["v"][:]
+        #       u_all = f["u"][:, sy, sx]   # shape (T, H', W')
+        #       v_all = f["v"][:, sy, sx]
         #   dt = self.METADATA.dt
         #   indices = time_indices or list(range(self.METADATA.n_time_steps))
         #   return {i * dt: {"u": u_all[i], "v": v_all[i]} for i in indices}
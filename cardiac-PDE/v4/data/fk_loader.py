@@ -6,12 +6,16 @@ with the standard DataSource interface so it can be swapped with PDEBench.
 """
 
 from __future__ import annotations
+import struct
+import zipfile
 from pathlib import Path
 from typing import Optional
 
 import numpy as np
 
-from data.base import DataSource, DatasetMetadata
+from data.base import (
+    DataSource, DatasetMetadata, SpatialIndex, normalize_spatial, read_sample_time_block,
+)
 
 _DEFAULT_FK_DIR = Path("../baselines models/fk_data")
 
@@ -21,6 +25,34 @@ FK_SNAPSHOT_TIMES = [
 ]
 
 
+def _npz_memmap(path: Path, key: str) -> np.ndarray:
+    """
+    Memory-map one array of an .npz archive without reading it.
+
+    np.savez stores members uncompressed (ZIP_STORED), so the .npy payload
+    sits at a fixed offset inside the zip and can be mapped directly. For
+    compressed archives (np.savez_compressed) this falls back to np.load.
+    """
+    with zipfile.ZipFile(path) as zf:
+        info = zf.getinfo(f"{key}.npy")
+        if info.compress_type != zipfile.ZIP_STORED:
+            return np.load(path)[key]
+    with open(path, "rb") as f:
+        # Local file header: 30 fixed bytes + filename + extra field
+        f.seek(info.header_offset)
+        header = f.read(30)
+        name_len, extra_len = struct.unpack("<HH", header[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        fmt = np.lib.format
+        if fmt.read_magic(f) == (1, 0):
+            shape, fortran, dtype = fmt.read_array_header_1_0(f)
+        else:
+            shape, fortran, dtype = fmt.read_array_header_2_0(f)
+        offset = f.tell()
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape,
+                     order="F" if fortran else "C", offset=offset)
+
+
 class FKDataLoader(DataSource):
     """
     Fenton-Karma 3V ground truth.
@@ -31,6 +63,8 @@ class FKDataLoader(DataSource):
         sim_data_{T}.csv    — per-snapshot at T in FK_SNAPSHOT_TIMES
 
     DataSource interface maps sample_idx=0 to the single available trajectory.
+    The NPZ arrays are memory-mapped, so spatial slices only touch the
+    selected rows/columns; the CSV fallback is parsed in full and sliced.
     """
 
     def __init__(
@@ -44,6 +78,7 @@ class FKDataLoader(DataSource):
         self.n = n
         self._subdir = self.data_dir / f"tau_d_{tau_d}"
         self._npz: Optional[dict] = None
+        self._raw: Optional[dict[str, np.ndarray]] = None  # memmapped (T, n, n) arrays
         self._ic: Optional[dict] = None
 
     def _load_npz(self):
@@ -51,7 +86,8 @@ class FKDataLoader(DataSource):
             return
         npz_path = self._subdir / "UVW_array_data.npz"
         if npz_path.exists():
-            raw = np.load(npz_path)
+            raw = {k: _npz_memmap(npz_path, k) for k in ("U", "V", "W")}
+            self._raw = raw
             self._npz = {
                 t: {"u": raw["U"][i], "v": raw["V"][i], "w": raw["W"][i]}
                 for i, t in enumerate(FK_SNAPSHOT_TIMES)
@@ -89,28 +125,59 @@ class FKDataLoader(DataSource):
             },
         )
 
-    def load_ic(self, sample_idx: int = 0) -> dict[str, np.ndarray]:
+    def load_ic(
+        self,
+        sample_idx: int = 0,
+        spatial: SpatialIndex = None,
+    ) -> dict[str, np.ndarray]:
         ic_path = self._subdir / "IC.csv"
         n = self.n
+        sl = normalize_spatial(spatial, 2)
         if ic_path.exists():
             data = np.loadtxt(ic_path, delimiter=",")
             return {
-                "u": data[:, 0].reshape(n, n),
-                "v": data[:, 1].reshape(n, n),
-                "w": data[:, 2].reshape(n, n),
+                "u": data[:, 0].reshape(n, n)[sl].copy(),
+                "v": data[:, 1].reshape(n, n)[sl].copy(),
+                "w": data[:, 2].reshape(n, n)[sl].copy(),
             }
         # If no IC file, return zero initial condition
-        return {v: np.zeros((n, n)) for v in ["u", "v", "w"]}
+        shape = np.empty((n, n))[sl].shape
+        return {v: np.zeros(shape) for v in ["u", "v", "w"]}
 
     def load_snapshots(
         self,
         sample_idx: int = 0,
         time_indices: Optional[list[int]] = None,
+        spatial: SpatialIndex = None,
     ) -> dict[float, dict[str, np.ndarray]]:
         self._load_npz()
+        sl = normalize_spatial(spatial, 2)
         all_times = FK_SNAPSHOT_TIMES
         if time_indices is not None:
             times = [all_times[i] for i in time_indices if i < len(all_times)]
         else:
             times = all_times
-        return {t: self._npz[t] for t in times if t in self._npz}
+        # np.array() materialises only the sliced pages of the memmap
+        return {
+            t: {var: np.array(arr[sl]) for var, arr in self._npz[t].items()}
+            for t in times if t in self._npz
+        }
+
+    def load_batch(
+        self,
+        sample_indices: list[int],
+        time_indices: Optional[list[int]] = None,
+        spatial: SpatialIndex = None,
+    ) -> np.ndarray:
+        """[B, T, 3, n', n']; every sample_idx maps to the single FK trajectory."""
+        self._load_npz()
+        if self._raw is None:  # CSV fallback has no array to index into
+            return super().load_batch(sample_indices, time_indices, spatial)
+        sl = normalize_spatial(spatial, 2)
+        indices = time_indices if time_indices is not None else list(range(len(FK_SNAPSHOT_TIMES)))
+        # Treat each (T, n, n) memmap as a one-sample [1, T, n, n] array
+        one = np.stack([
+            read_sample_time_block(self._raw[k][None], [0], indices, sl)[0]
+            for k in ("U", "V", "W")
+        ], axis=1)  # (T, 3, n', n')
+        return np.broadcast_to(one, (len(sample_indices),) + one.shape).copy()
@@ -30,7 +30,9 @@ from typing import Optional
 
 import numpy as np
 
-from data.base import DataSource, DatasetMetadata
+from data.base import (
+    DataSource, DatasetMetadata, SpatialIndex, normalize_spatial, read_sample_time_block,
+)
 
 # Default local path — override with PDEBENCH_DATA_DIR env var or constructor arg
 _DEFAULT_DATA_DIR = Path(os.environ.get("PDEBENCH_DATA_DIR", "./data/raw/pdebench"))
@@ -103,28 +105,49 @@ class PDEBench2DRDLoader(DataSource):
             dx=dx,
             domain_size=1.0,
             params={"Du": 1e-3, "Dv": 5e-3, "k": 5e-3},
+            n_samples=self._N,
         )
 
-    def load_ic(self, sample_idx: int = 0) -> dict[str, np.ndarray]:
+    def load_ic(
+        self,
+        sample_idx: int = 0,
+        spatial: SpatialIndex = None,
+    ) -> dict[str, np.ndarray]:
         self._ensure_loaded()
-        frame = self._data[sample_idx, 0, :, :, :]  # (X, Y, V)
+        sx, sy = normalize_spatial(spatial, 2)
+        frame = self._data[sample_idx, 0, sx, sy, :]  # (X, Y, V) hyperslab
         return {"u": frame[:, :, 0], "v": frame[:, :, 1]}
 
     def load_snapshots(
         self,
         sample_idx: int = 0,
         time_indices: Optional[list[int]] = None,
+        spatial: SpatialIndex = None,
     ) -> dict[float, dict[str, np.ndarray]]:
         self._ensure_loaded()
+        sx, sy = normalize_spatial(spatial, 2)
         dt = 5.0 / (self._T - 1)
         indices = time_indices if time_indices is not None else list(range(self._T))
         result = {}
         for ti in indices:
-            frame = self._data[sample_idx, ti, :, :, :]  # (X, Y, V)
+            frame = self._data[sample_idx, ti, sx, sy, :]  # (X, Y, V) hyperslab
             t = round(ti * dt, 6)
             result[t] = {"u": frame[:, :, 0], "v": frame[:, :, 1]}
         return result
 
+    def load_batch(
+        self,
+        sample_indices: list[int],
+        time_indices: Optional[list[int]] = None,
+        spatial: SpatialIndex = None,
+    ) -> np.ndarray:
+        """[B, T, V, X', Y'] from one sorted hyperslab / fancy-index read."""
+        self._ensure_loaded()
+        sx, sy = normalize_spatial(spatial, 2)
+        indices = time_indices if time_indices is not None else list(range(self._T))
+        block = read_sample_time_block(self._data, sample_indices, indices, (sx, sy, slice(None)))
+        return np.ascontiguousarray(np.moveaxis(block, -1, 2))  # V last → V third
+
     def __del__(self):
         if self._h5 is not None:
             try:
@@ -191,25 +214,46 @@ class PDEBench1DBurgersLoader(DataSource):
             dx=2.0 / self._X,
             domain_size=2.0,
             params={"nu": self.nu},
+            n_samples=self._N,
         )
 
-    def load_ic(self, sample_idx: int = 0) -> dict[str, np.ndarray]:
+    def load_ic(
+        self,
+        sample_idx: int = 0,
+        spatial: SpatialIndex = None,
+    ) -> dict[str, np.ndarray]:
         self._ensure_loaded()
-        return {"u": self._data[sample_idx, 0, :, 0]}
+        (sx,) = normalize_spatial(spatial, 1)
+        return {"u": self._data[sample_idx, 0, sx, 0]}
 
     def load_snapshots(
         self,
         sample_idx: int = 0,
         time_indices: Optional[list[int]] = None,
+        spatial: SpatialIndex = None,
     ) -> dict[float, dict[str, np.ndarray]]:
         self._ensure_loaded()
+        (sx,) = normalize_spatial(spatial, 1)
         dt = 2.0 / (self._T - 1)
         indices = time_indices if time_indices is not None else list(range(self._T))
         return {
-            round(ti * dt, 6): {"u": self._data[sample_idx, ti, :, 0]}
+            round(ti * dt, 6): {"u": self._data[sample_idx, ti, sx, 0]}
             for ti in indices
         }
 
+    def load_batch(
+        self,
+        sample_indices: list[int],
+        time_indices: Optional[list[int]] = None,
+        spatial: SpatialIndex = None,
+    ) -> np.ndarray:
+        """[B, T, 1, X'] from one sorted hyperslab / fancy-index read."""
+        self._ensure_loaded()
+        (sx,) = normalize_spatial(spatial, 1)
+        indices = time_indices if time_indices is not None else list(range(self._T))
+        block = read_sample_time_block(self._data, sample_indices, indices, (sx, slice(0, 1)))
+        return np.ascontiguousarray(np.moveaxis(block, -1, 2))
+
     def __del__(self):
         if self._h5 is not None:
             try:
@@ -0,0 +1,252 @@
+"""
+data/store_loader.py — Unified chunked HDF5 dataset store.
+
+Every data source (FK NPZ/CSV, PDEBench HDF5, v6 IC/solution files) can be
+converted into one fixed schema with data/convert_to_store.py, after which
+all pipelines read it through StoreLoader.
+
+Store schema (version 2)
+------------------------
+    /fields   float32 [N, T, V, *spatial]   chunked one frame per chunk
+                                            (all variables of one (n, t)),
+                                            gzip + shuffle compressed
+    /ic       float64 [N, V, *spatial]      source.load_ic() of each sample,
+                                            stored exactly; it need not be
+                                            frame 0 (FK snapshots start at
+                                            t=831.25, its IC is t=0)
+    /times    float64 [T]                   snapshot times
+    attrs     schema_version, name, var_names (JSON), t_start, t_end, dt, dx,
+              domain_size, params (JSON), source,
+              sample_digests (JSON, optional): digest of each sample's IC
+              followed by its full snapshot dict (as snapshot_digest()
+              hashes them), so callers can key caches without re-hashing
+              the data
+
+Frame-sized chunks mean a snapshot read decompresses exactly one chunk, and
+a spatial slice (see data.base.SpatialIndex) is applied inside the chunk.
+The file is opened read-only and lazily per process, so forked workers each
+get their own handle and can read in parallel.
+"""
+
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from data.base import (
+    DataSource, DatasetMetadata, SpatialIndex, new_hasher, normalize_spatial,
+    read_sample_time_block, update_digest,
+)
+
+SCHEMA_VERSION = 2
+
+_DEFAULT_STORE_DIR = Path("./data/store")
+
+# Chunks larger than this are split along the first spatial axis
+_MAX_CHUNK_BYTES = 8 * 1024 ** 2
+# HDF5 chunk cache per open file; must hold at least one frame chunk
+_CHUNK_CACHE_BYTES = 64 * 1024 ** 2
+
+
+def _frame_chunks(n_vars: int, spatial_shape: tuple[int, ...]) -> tuple[int, ...]:
+    """Chunk shape holding one (sample, time) frame, capped at _MAX_CHUNK_BYTES."""
+    rows = spatial_shape[0]
+    row_bytes = 4 * n_vars * int(np.prod(spatial_shape[1:], dtype=np.int64))
+    rows = max(1, min(rows, _MAX_CHUNK_BYTES // max(row_bytes, 1)))
+    return (1, 1, n_vars, rows) + tuple(spatial_shape[1:])
+
+
+def write_store(
+    path: str | Path,
+    source: DataSource,
+    sample_indices: Optional[list[int]] = None,
+    time_indices: Optional[list[int]] = None,
+    compression_level: int = 4,
+    source_label: str = "",
+) -> Path:
+    """
+    Convert any DataSource into a store file at path.
+
+    Frames are copied one at a time, so memory use is one frame regardless
+    of the dataset size. Each sample's load_ic() is stored alongside its
+    snapshots. Returns the path written.
+    """
+    import h5py
+
+    meta = source.get_metadata()
+    samples = sample_indices if sample_indices is not None else list(range(meta.n_samples))
+    if time_indices is None:
+        time_indices = list(range(meta.n_time_steps))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    shape = (len(samples), len(time_indices), meta.n_vars) + tuple(meta.spatial_shape)
+    times = np.empty(len(time_indices))
+
+    with h5py.File(path, "w") as f:
+        fields = f.create_dataset(
+            "fields", shape=shape, dtype="f4",
+            chunks=_frame_chunks(meta.n_vars, tuple(meta.spatial_shape)),
+            compression="gzip", compression_opts=compression_level, shuffle=True,
+        )
+        ics = f.create_dataset(
+            "ic", shape=(len(samples), meta.n_vars) + tuple(meta.spatial_shape), dtype="f8",
+            chunks=(1, meta.n_vars) + tuple(meta.spatial_shape),
+            compression="gzip", compression_opts=compression_level, shuffle=True,
+        )
+        digests = []
+        for n, sample_idx in enumerate(samples):
+            h = new_hasher()
+            ic = source.load_ic(sample_idx=sample_idx)
+            ics[n] = np.stack([np.asarray(ic[v], dtype=np.float64) for v in meta.var_names])
+            h.update(b"ic")  # the IC has no snapshot time; tag it instead
+            update_digest(h, 0.0, {v: ics[n, i] for i, v in enumerate(meta.var_names)})
+            for k, ti in enumerate(time_indices):
+                snap = source.load_snapshots(sample_idx=sample_idx, time_indices=[ti])
+                (t, frame), = snap.items()
+                block = np.stack([frame[v] for v in meta.var_names]).astype(np.float32)
+                fields[n, k] = block
+                times[k] = t
+                # Hash exactly what StoreLoader.load_snapshots() will return
+                update_digest(h, t, dict(zip(meta.var_names, block)))
+            digests.append(h.hexdigest())
+        f.create_dataset("times", data=times)
+        if np.all(np.diff(times) > 0):
+            f.attrs["sample_digests"] = json.dumps(digests)
+        f.attrs.update({
+            "schema_version": SCHEMA_VERSION,
+            "name":           meta.name,
+            "var_names":      json.dumps(meta.var_names),
+            "t_start":        float(times[0]),
+            "t_end":          float(times[-1]),
+            "dt":             meta.dt,
+            "dx":             meta.dx,
+            "domain_size":    meta.domain_size,
+            "params":         json.dumps(meta.params),
+            "source":         source_label or type(source).__name__,
+        })
+    return path
+
+
+class StoreLoader(DataSource):
+    """
+    Reads a store written by write_store() / data/convert_to_store.py.
+
+    Either pass the file path directly, or a data_dir plus store name
+    (the file is then data_dir/<store_name>.h5).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        data_dir: str = str(_DEFAULT_STORE_DIR),
+        store_name: str = "fk",
+    ):
+        self.path = Path(path) if path else Path(data_dir) / f"{store_name}.h5"
+        self._h5 = None
+        self._pid: Optional[int] = None
+        self._meta: Optional[DatasetMetadata] = None
+
+    def _ensure_open(self):
+        # Reopen after fork: HDF5 handles must not be shared across processes
+        if self._h5 is not None and self._pid == os.getpid():
+            return
+        if not self.path.exists():
+            raise FileNotFoundError(
+                f"Dataset store not found: {self.path}\n"
+                f"Create it with: python data/convert_to_store.py --help"
+            )
+        import h5py
+        self._h5 = h5py.File(self.path, "r", rdcc_nbytes=_CHUNK_CACHE_BYTES)
+        self._pid = os.getpid()
+        version = int(self._h5.attrs.get("schema_version", 0))
+        if version != SCHEMA_VERSION:
+            raise ValueError(
+                f"{self.path} has store schema {version}, expected {SCHEMA_VERSION}"
+            )
+        self._fields = self._h5["fields"]  # [N, T, V, *spatial]
+        self._ics = self._h5["ic"]         # [N, V, *spatial]
+        self._times = [round(float(t), 6) for t in self._h5["times"][:]]
+
+    def get_metadata(self) -> DatasetMetadata:
+        self._ensure_open()
+        if self._meta is None:
+            a = self._h5.attrs
+            N, T, V = self._fields.shape[:3]
+            self._meta = DatasetMetadata(
+                name=str(a["name"]),
+                n_vars=V,
+                var_names=json.loads(a["var_names"]),
+                spatial_shape=tuple(self._fields.shape[3:]),
+                n_time_steps=T,
+                t_start=float(a["t_start"]),
+                t_end=float(a["t_end"]),
+                dt=float(a["dt"]),
+                dx=float(a["dx"]),
+                domain_size=float(a["domain_size"]),
+                params=json.loads(a["params"]),
+                n_samples=N,
+            )
+        return self._meta
+
+    def _read_frame(self, sample_idx: int, ti: int, spatial: SpatialIndex) -> dict[str, np.ndarray]:
+        meta = self.get_metadata()
+        sl = normalize_spatial(spatial, len(meta.spatial_shape))
+        frame = self._fields[(sample_idx, ti, slice(None)) + sl]  # (V, *spatial') hyperslab
+        return {v: frame[i] for i, v in enumerate(meta.var_names)}
+
+    def load_ic(
+        self,
+        sample_idx: int = 0,
+        spatial: SpatialIndex = None,
+    ) -> dict[str, np.ndarray]:
+        meta = self.get_metadata()
+        sl = normalize_spatial(spatial, len(meta.spatial_shape))
+        ic = self._ics[(sample_idx, slice(None)) + sl]
+        return {v: ic[i] for i, v in enumerate(meta.var_names)}
+
+    def load_snapshots(
+        self,
+        sample_idx: int = 0,
+        time_indices: Optional[list[int]] = None,
+        spatial: SpatialIndex = None,
+    ) -> dict[float, dict[str, np.ndarray]]:
+        self._ensure_open()
+        indices = time_indices if time_indices is not None else range(len(self._times))
+        return {self._times[ti]: self._read_frame(sample_idx, ti, spatial) for ti in indices}
+
+    def snapshot_digest(self, sample_idx: int = 0) -> Optional[str]:
+        self._ensure_open()
+        digests = self._h5.attrs.get("sample_digests")
+        return json.loads(digests)[sample_idx] if digests is not None else None
+
+    def load_batch(
+        self,
+        sample_indices: list[int],
+        time_indices: Optional[list[int]] = None,
+        spatial: SpatialIndex = None,
+    ) -> np.ndarray:
+        """[B, T, V, *spatial'] — the on-disk layout, read as one sorted block."""
+        meta = self.get_metadata()
+        sl = normalize_spatial(spatial, len(meta.spatial_shape))
+        indices = time_indices if time_indices is not None else list(range(len(self._times)))
+        return read_sample_time_block(self._fields, sample_indices, indices, (slice(None),) + sl)
+
+    def __getstate__(self):
+        # Picklable for process pools: the handle is reopened in the worker
+        state = self.__dict__.copy()
+        state.update(_h5=None, _pid=None)
+        state.pop("_fields", None)
+        state.pop("_ics", None)
+        return state
+
+    def __del__(self):
+        # getattr: __init__ may have raised before the handle attribute existed
+        if getattr(self, "_h5", None) is not None and self._pid == os.getpid():
+            try:
+                self._h5.close()
+            except Exception:
+                pass
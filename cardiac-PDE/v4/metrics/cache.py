@@ -0,0 +1,86 @@
+"""
+metrics/cache.py — Content-addressed cache for metric results.
+
+Re-running the pipeline after changing one baseline should not recompute
+the metrics of methods whose output did not change. Results are stored as
+small JSON files keyed on
+
+    metric name + METRICS_VERSION + digests of the inputs + parameters
+
+where the digests come from data.base.snapshot_digest() (xxh3 if xxhash is
+installed, else blake2b) or from a digest the data source already stores
+(DataSource.snapshot_digest()). Bump metrics.metrics.METRICS_VERSION when a
+metric definition changes and every cached entry is invalidated.
+
+    cache = MetricCache(RESULTS / "metric_cache")
+    acc = cache.get_or_compute("accuracy_suite", [pred_digest, gt_digest],
+                               lambda: full_accuracy_suite(pred, gt, var_names))
+"""
+
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+from data.base import new_hasher
+from metrics.metrics import METRICS_VERSION
+
+
+class MetricCache:
+    """JSON-file cache of metric dicts; enabled=False turns it into a pass-through."""
+
+    def __init__(self, cache_dir: str | Path, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(metric: str, digests: list[str], **params) -> str:
+        h = new_hasher()
+        h.update(json.dumps(
+            {"metric": metric, "version": METRICS_VERSION,
+             "inputs": list(digests), "params": params},
+            sort_keys=True, default=str,
+        ).encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        try:
+            value = json.loads(self._path(key).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        if not self.enabled:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(value))
+        os.replace(tmp, path)  # atomic, so concurrent runs never see partial files
+
+    def get_or_compute(
+        self,
+        metric: str,
+        digests: list[str],
+        compute: Callable[[], dict],
+        **params,
+    ) -> dict:
+        """Cached compute() result for these inputs (NaN values round-trip)."""
+        key = self.key(metric, digests, **params)
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = compute()
+        self.put(key, value)
+        return value
@@ -17,9 +17,14 @@ Additional metrics for completeness:
 
 from __future__ import annotations
 import time
+from dataclasses import dataclass
 import numpy as np
 from typing import Optional
 
+# Bump whenever a metric definition or its numerics change; this invalidates
+# every entry in metrics.cache.MetricCache.
+METRICS_VERSION = 1
+
 
 # ============================================================
 # 1. RMSE (primary)
@@ -58,6 +63,76 @@ def rmse_all_vars(
 # 2. Bug-free rate (primary)
 # ============================================================
 
+@dataclass
+class ValidityReport:
+    """
+    Outcome of validity_report(). Truthy when the run is valid; otherwise
+    time / var / index / value locate the first violation found.
+    """
+    valid: bool
+    reason: str = ""
+    time: Optional[float] = None
+    var: Optional[str] = None
+    index: Optional[tuple[int, ...]] = None
+    value: Optional[float] = None
+
+    def __bool__(self) -> bool:
+        return self.valid
+
+    def message(self) -> str:
+        """One-line description, suitable for logs and debug prompts."""
+        if self.valid:
+            return "valid"
+        where = []
+        if self.time is not None:
+            where.append(f"t={self.time}")
+        if self.var is not None:
+            where.append(f"variable '{self.var}'")
+        if self.index is not None:
+            where.append(f"pixel {self.index}")
+        value = f" (value {self.value!r})" if self.value is not None else ""
+        return f"{self.reason}{value}" + (f" at {', '.join(where)}" if where else "")
+
+
+def validity_report(
+    snaps: dict[float, dict[str, np.ndarray]],
+    var_names: list[str],
+    valid_range: tuple[float, float] = (0.0, 1.0),
+    tol: float = 1e-3,
+    chunk_elems: int = 1 << 16,
+) -> ValidityReport:
+    """
+    Scan snapshots in time order for the first physically invalid value.
+
+    Each array is read in chunks of chunk_elems values; per chunk only
+    min() and max() are computed (both propagate NaN, so one pair of
+    reductions covers non-finite and out-of-range values) and the scan stops
+    at the first violating chunk, where the first bad pixel is located.
+    """
+    if not snaps:
+        return ValidityReport(False, "no snapshots produced")
+    lo, hi = valid_range[0] - tol, valid_range[1] + tol
+    for t in sorted(snaps):
+        snap = snaps[t]
+        for v in var_names:
+            if v not in snap:
+                return ValidityReport(False, "missing variable", time=t, var=v)
+            arr = np.asarray(snap[v])
+            flat = arr.reshape(-1)
+            for a in range(0, flat.size, chunk_elems):
+                c = flat[a:a + chunk_elems]
+                if c.min() >= lo and c.max() <= hi:
+                    continue
+                k = int(np.argmax(~((c >= lo) & (c <= hi))))
+                x = float(c[k])
+                reason = ("non-finite value" if not np.isfinite(x)
+                          else "value below valid range" if x < lo
+                          else "value above valid range")
+                index = tuple(int(i) for i in np.unravel_index(a + k, arr.shape))
+                return ValidityReport(False, reason, time=t, var=v, index=index, value=x)
+    return ValidityReport(True)
+
+
 def is_physically_valid(
     snaps: dict[float, dict[str, np.ndarray]],
     var_names: list[str],
@@ -68,20 +143,9 @@ def is_physically_valid(
       1. At least one snapshot was produced.
       2. All values are finite (no NaN or Inf).
       3. All values fall within valid_range.
+    See validity_report() for where a failing run goes wrong.
     """
-    if not snaps:
-        return False
-    lo, hi = valid_range
-    for snap in snaps.values():
-        for v in var_names:
-            if v not in snap:
-                return False
-            arr = snap[v]
-            if not np.all(np.isfinite(arr)):
-                return False
-            if np.any(arr < lo - 1e-3) or np.any(arr > hi + 1e-3):
-                return False
-    return True
+    return validity_report(snaps, var_names, valid_range).valid
 
 
 def bug_free_rate(trial_results: list[dict]) -> float:
@@ -142,12 +206,216 @@ def max_absolute_error(pred: np.ndarray, gt: np.ndarray) -> float:
     return float(np.max(np.abs(pred - gt)))
 
 
+def _axis_slice(ndim: int, axis: int, start: int, stop: Optional[int]) -> tuple:
+    sl = [slice(None)] * ndim
+    sl[axis] = slice(start, stop)
+    return tuple(sl)
+
+
+def _valid_filter(a: np.ndarray, weights: Optional[np.ndarray], win: int, axis: int) -> np.ndarray:
+    """
+    Correlate a with a length-win window along axis, keeping only the valid
+    part (no padding). weights must be symmetric; weights=None is an
+    unnormalised box sum, built from power-of-two partial sums (4 adds for
+    win=7 instead of 6).
+    """
+    n = a.shape[axis] - win + 1
+    if weights is not None:
+        # Symmetric odd-length kernel: pair taps k and win−1−k
+        c = win // 2
+        out = weights[c] * a[_axis_slice(a.ndim, axis, c, c + n)]
+        for k in range(c):
+            k2 = win - 1 - k
+            pair = a[_axis_slice(a.ndim, axis, k, k + n)] + a[_axis_slice(a.ndim, axis, k2, k2 + n)]
+            pair *= weights[k]
+            out += pair
+        return out
+    out, offset, size, part = None, 0, 1, a
+    while size <= win:
+        if win & size:
+            piece = part[_axis_slice(a.ndim, axis, offset, offset + n)]
+            out = piece.copy() if out is None else np.add(out, piece, out=out)
+            offset += size
+        if 2 * size > win:
+            break
+        m = part.shape[axis] - size
+        part = part[_axis_slice(a.ndim, axis, 0, m)] + part[_axis_slice(a.ndim, axis, size, size + m)]
+        size *= 2
+    return out
+
+
+def ssim_batch(
+    pred: np.ndarray,
+    gt: np.ndarray,
+    data_range: float = 1.0,
+    spatial_ndim: int = 2,
+    gaussian_weights: bool = False,
+    win_size: Optional[int] = None,
+    sigma: float = 1.5,
+    block_bytes: int = 256 * 1024,
+) -> np.ndarray:
+    """
+    Mean SSIM of every frame in a stack, without scikit-image.
+
+    pred, gt : arrays of shape [*lead, *spatial]; the last spatial_ndim axes
+               form one frame. Returns an array of shape lead.
+
+    Follows skimage.metrics.structural_similarity defaults: a 7-wide
+    uniform window (or a Gaussian with sigma 1.5, 11 wide, when
+    gaussian_weights=True; win_size then follows from sigma), K1=0.01,
+    K2=0.03 and sample covariance. Like skimage, the mean is taken over the
+    region a half-window away from the border. That region never touches
+    padding, so the local means are valid separable filters of X, Y,
+    X² + Y² and XY (SSIM only needs the sum of the two variances).
+
+    Work proceeds in blocks of whole frames (small frames) or row strips of
+    one frame (large frames), each about block_bytes per statistic, so all
+    intermediates stay cache-resident. Frames smaller than the window give NaN.
+    """
+    if gaussian_weights:
+        # scipy.ndimage.gaussian_filter with truncate=3.5, as skimage uses
+        win_size = 2 * int(3.5 * sigma + 0.5) + 1
+        r = np.arange(win_size) - (win_size - 1) / 2
+        weights = np.exp(-0.5 * (r / sigma) ** 2)
+        weights /= weights.sum()
+    else:
+        win_size = win_size or 7
+        weights = None
+
+    lead = pred.shape[:pred.ndim - spatial_ndim]
+    spatial = pred.shape[pred.ndim - spatial_ndim:]
+    n_frames = int(np.prod(lead, dtype=np.int64))
+    if min(spatial) < win_size:
+        return np.full(lead, np.nan)
+
+    # The filters return scale × local mean (scale = NP for the box sum).
+    # Writing SSIM in terms of these sums, all normalisations cancel
+    # between numerator and denominator except in the constants:
+    #   SSIM = (2a + c1)(2(s·Sxy − a) + c2) / ((b + c1)(s·Ssq − b + c2))
+    # with a = Sx·Sy, b = Sx² + Sy², c1 = C1·s², c2 = C2·s²·(NP−1)/NP.
+    NP = win_size ** spatial_ndim
+    scale = 1.0 if gaussian_weights else float(NP)
+    c1 = (0.01 * data_range) ** 2 * scale ** 2
+    c2 = (0.03 * data_range) ** 2 * scale ** 2 * (NP - 1) / NP
+
+    X_all = pred.reshape((n_frames,) + spatial)
+    Y_all = gt.reshape((n_frames,) + spatial)
+    n_rows = spatial[0] - win_size + 1          # valid rows per frame
+    row_elems = int(np.prod(spatial[1:], dtype=np.int64))
+    budget = max(1, block_bytes // 8)
+    frames_per = max(1, budget // (row_elems * spatial[0]))
+    rows_per = n_rows if frames_per > 1 else max(1, budget // row_elems)
+
+    def local(field):
+        for ax in range(1, field.ndim):
+            field = _valid_filter(field, weights, win_size, ax)
+        return field
+
+    sums = np.zeros(n_frames)
+    for f0 in range(0, n_frames, frames_per):
+        f1 = min(f0 + frames_per, n_frames)
+        for r0 in range(0, n_rows, rows_per):
+            r1 = min(r0 + rows_per, n_rows)
+            X = X_all[f0:f1, r0:r1 + win_size - 1].astype(np.float64, copy=False)
+            Y = Y_all[f0:f1, r0:r1 + win_size - 1].astype(np.float64, copy=False)
+            sq = X * X
+            sq += Y * Y
+            Sx, Sy, Ssq, Sxy = local(X), local(Y), local(sq), local(X * Y)
+
+            a = Sx * Sy
+            b = np.multiply(Sx, Sx, out=Sx)
+            b += np.multiply(Sy, Sy, out=Sy)
+            Sxy *= scale
+            Sxy -= a
+            Sxy *= 2
+            Sxy += c2                                 # 2(s·Sxy − a) + c2
+            a *= 2
+            a += c1                                   # 2a + c1
+            Ssq *= scale
+            Ssq -= b
+            Ssq += c2                                 # s·Ssq − b + c2
+            b += c1                                   # b + c1
+            a *= Sxy
+            b *= Ssq
+            a /= b
+            sums[f0:f1] += a.reshape(f1 - f0, -1).sum(axis=1)
+    n_valid = n_rows * int(np.prod([n - win_size + 1 for n in spatial[1:]], dtype=np.int64))
+    return (sums / n_valid).reshape(lead)
+
+
 def ssim(pred: np.ndarray, gt: np.ndarray, data_range: float = 1.0) -> float:
-    try:
-        from skimage.metrics import structural_similarity
-        return float(structural_similarity(pred, gt, data_range=data_range))
-    except ImportError:
-        return float("nan")
+    """Mean SSIM of one frame (see ssim_batch())."""
+    return float(ssim_batch(pred[None], gt[None], data_range, spatial_ndim=pred.ndim)[0])
+
+
+def frame_errors(
+    pred: np.ndarray,
+    gt: np.ndarray,
+    spatial_ndim: int = 2,
+    chunk_bytes: int = 4 * 1024 ** 2,
+) -> dict[str, np.ndarray]:
+    """
+    Fused per-frame RMSE, relative L2 and max absolute error.
+
+    pred, gt : arrays of shape [*lead, *spatial], e.g. [T, V, H, W] or
+               [B, T, V, H, W]; the last spatial_ndim axes form one frame.
+    Returns {"rmse", "l2", "mae"} arrays of shape lead.
+
+    pred − gt is formed once per block of frames (about chunk_bytes of
+    data, so the block stays cache-resident) and all three reductions run
+    on it. Values are bitwise identical to rmse(), relative_l2_error() and
+    max_absolute_error() on each frame (the L2 norms use the same BLAS dot
+    as np.linalg.norm, via a batched matmul).
+    """
+    lead = pred.shape[:pred.ndim - spatial_ndim]
+    n_frames = int(np.prod(lead, dtype=np.int64))
+    P = pred.reshape(n_frames, -1)
+    G = gt.reshape(n_frames, -1)
+    frame_bytes = max(P.shape[1] * P.itemsize, 1)
+    step = max(1, chunk_bytes // frame_bytes)
+    out = {k: np.empty(n_frames) for k in ("rmse", "l2", "mae")}
+    for a in range(0, n_frames, step):
+        b = min(a + step, n_frames)
+        d = P[a:b] - G[a:b]
+        g = G[a:b]
+        d_sq = (d[:, None, :] @ d[:, :, None]).ravel()
+        g_sq = (g[:, None, :] @ g[:, :, None]).ravel()
+        out["rmse"][a:b] = np.sqrt(np.mean(d * d, axis=1))
+        out["l2"][a:b] = np.sqrt(d_sq) / (np.sqrt(g_sq) + 1e-10)
+        out["mae"][a:b] = np.maximum(d.max(axis=1), -d.min(axis=1))
+    return {k: v.reshape(lead) for k, v in out.items()}
+
+
+def _summarise_per_var(
+    per_var: dict[str, dict[str, list]],
+    var_names: list[str],
+) -> dict[str, float]:
+    result = {}
+    for v, metrics in per_var.items():
+        for name, vals in metrics.items():
+            result[f"{name}_{v}"] = float(np.mean(vals)) if len(vals) else float("nan")
+
+    # Mean across all variables
+    result["rmse_mean"] = float(np.nanmean([result[f"rmse_{v}"] for v in var_names]))
+    result["l2_mean"]   = float(np.nanmean([result[f"l2_{v}"]   for v in var_names]))
+    return result
+
+
+def accuracy_suite_stacked(
+    pred: np.ndarray,
+    gt:   np.ndarray,
+    var_names: list[str],
+) -> dict[str, float]:
+    """
+    full_accuracy_suite() for stacked arrays of shape [T, V, H, W]
+    (variables in var_names order). Same keys and values.
+    """
+    errs = frame_errors(pred, gt, spatial_ndim=pred.ndim - 2)
+    errs["ssim"] = ssim_batch(pred, gt, spatial_ndim=pred.ndim - 2)
+    per_var = {}
+    for j, v in enumerate(var_names):
+        per_var[v] = {name: np.ascontiguousarray(errs[name][:, j]) for name in ("rmse", "l2", "mae", "ssim")}
+    return _summarise_per_var(per_var, var_names)
 
 
 def full_accuracy_suite(
@@ -158,6 +426,9 @@ def full_accuracy_suite(
     """
     Compute RMSE, L2, MaxAE, SSIM for all shared snapshots and variables.
     Returns a flat dict with keys like rmse_u, l2_u, mae_u, ssim_u, rmse_mean, etc.
+
+    Each frame is scored in a single fused pass (see frame_errors()), so
+    pred − gt is formed once per frame instead of once per metric.
     """
     shared = sorted(set(pred_snaps) & set(gt_snaps))
     per_var: dict[str, dict[str, list]] = {
@@ -169,20 +440,12 @@ def full_accuracy_suite(
         for v in var_names:
             if v in pred_snaps[t] and v in gt_snaps[t]:
                 p, g = pred_snaps[t][v], gt_snaps[t][v]
-                per_var[v]["rmse"].append(rmse(p, g))
-                per_var[v]["l2"].append(relative_l2_error(p, g))
-                per_var[v]["mae"].append(max_absolute_error(p, g))
+                errs = frame_errors(p[None], g[None], spatial_ndim=p.ndim)
+                for name in ("rmse", "l2", "mae"):
+                    per_var[v][name].append(float(errs[name][0]))
                 per_var[v]["ssim"].append(ssim(p, g))
 
-    result = {}
-    for v, metrics in per_var.items():
-        for name, vals in metrics.items():
-            result[f"{name}_{v}"] = float(np.mean(vals)) if vals else float("nan")
-
-    # Mean across all variables
-    result["rmse_mean"] = float(np.nanmean([result[f"rmse_{v}"] for v in var_names]))
-    result["l2_mean"]   = float(np.nanmean([result[f"l2_{v}"]   for v in var_names]))
-    return result
+    return _summarise_per_var(per_var, var_names)
 
 
 # ============================================================
@@ -221,14 +484,511 @@ def conduction_velocity(
     return abs(x2 - x1) * dx / dt_between
 
 
+class ActivationMapper:
+    """
+    Per-pixel activation, repolarization and APD maps, built one frame at a
+    time (usable as a solver sink via mapper(t, {"u": u, ...})).
+
+    A beat is an upward threshold crossing followed by a downward one with a
+    peak above min_peak in between (the criterion action_potential_duration()
+    uses); the first such beat is kept per pixel. Crossing detection is
+    vectorized over the grid and only the (sparse) crossing pixels are
+    touched; crossing times are linearly interpolated between frames unless
+    interpolate=False, in which case the later frame time is used.
+    Memory is O(one frame).
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.13,
+        min_peak: float = 0.5,
+        interpolate: bool = True,
+        var: str = "u",
+    ):
+        self.threshold = threshold
+        self.min_peak = min_peak
+        self.interpolate = interpolate
+        self.var = var
+        self._shape: Optional[tuple[int, ...]] = None
+
+    def _reset(self, shape: tuple[int, ...]):
+        n = int(np.prod(shape, dtype=np.int64))
+        self._shape = shape
+        self._act = np.full(n, np.nan)       # completed beats
+        self._repol = np.full(n, np.nan)
+        self._t_up = np.full(n, np.nan)      # upstroke of the beat in progress
+        self._peak = np.full(n, -np.inf)
+        self._done = np.zeros(n, dtype=bool)
+        self._prev: Optional[np.ndarray] = None
+        self._prev_above: Optional[np.ndarray] = None
+        self._prev_t = 0.0
+
+    def _cross_time(self, idx: np.ndarray, u: np.ndarray, t: float) -> np.ndarray:
+        if not self.interpolate:
+            return np.full(len(idx), t)
+        u0, u1 = self._prev[idx], u[idx]
+        return self._prev_t + (t - self._prev_t) * (self.threshold - u0) / (u1 - u0)
+
+    def update(self, t: float, u: np.ndarray) -> None:
+        if self._shape is None:
+            self._reset(u.shape)
+        u = np.asarray(u, dtype=np.float64).ravel()
+        above = u > self.threshold
+        if self._prev is not None:
+            pending = ~self._done
+            up = np.flatnonzero(above & ~self._prev_above & pending)
+            self._t_up[up] = self._cross_time(up, u, t)
+            self._peak[up] = -np.inf
+            np.maximum(self._peak, u, out=self._peak, where=above)
+
+            down = np.flatnonzero(self._prev_above & ~above & pending)
+            t_down = self._cross_time(down, u, t)
+            ok = (self._peak[down] > self.min_peak) & ~np.isnan(self._t_up[down])
+            beat = down[ok]
+            self._act[beat] = self._t_up[beat]
+            self._repol[beat] = t_down[ok]
+            self._done[beat] = True
+            self._t_up[down[~ok]] = np.nan  # sub-threshold excursion: discard
+        self._prev, self._prev_above, self._prev_t = u.copy(), above, t
+
+    def __call__(self, t: float, frame: dict[str, np.ndarray]) -> None:
+        self.update(t, frame[self.var])
+
+    def maps(self) -> dict[str, np.ndarray]:
+        """
+        {"activation", "repolarization", "apd"} maps (NaN where undefined).
+        Pixels whose first beat has not repolarized yet still get an
+        activation time if their peak so far exceeds min_peak.
+        """
+        if self._shape is None:
+            raise ValueError("ActivationMapper.maps() called before any frame")
+        in_progress = ~self._done & (self._peak > self.min_peak)
+        act = np.where(in_progress, self._t_up, self._act)
+        return {
+            "activation":     act.reshape(self._shape),
+            "repolarization": self._repol.reshape(self._shape),
+            "apd":            (self._repol - self._act).reshape(self._shape),
+        }
+
+
+def activation_maps(
+    u_stack: np.ndarray,
+    dt: float = 0.025,
+    t0: float = 0.0,
+    threshold: float = 0.13,
+    min_peak: float = 0.5,
+    interpolate: bool = True,
+) -> dict[str, np.ndarray]:
+    """
+    Activation-time, repolarization-time and APD maps from a [T, *spatial]
+    stack sampled every dt from t0 (see ActivationMapper).
+    """
+    mapper = ActivationMapper(threshold, min_peak, interpolate)
+    for k in range(u_stack.shape[0]):
+        mapper.update(t0 + k * dt, u_stack[k])
+    return mapper.maps()
+
+
+def conduction_velocity_field(
+    activation: np.ndarray,
+    dx: float = 0.0390625,
+    min_gradient: float = 1e-8,
+) -> dict[str, np.ndarray]:
+    """
+    CV vector field from an activation-time map: v = ∇T / |∇T|².
+
+    Returns {"cv_x", "cv_y", "speed"} (speed = 1/|∇T|, in the physical
+    length units of dx per time unit, since the gradient is taken with
+    spacing dx); NaN where T is undefined or |∇T| < min_gradient.
+    """
+    gy, gx = np.gradient(activation, dx)
+    g2 = gx * gx + gy * gy
+    ok = g2 >= min_gradient ** 2  # False for NaN too
+    inv = np.divide(1.0, g2, out=np.full_like(g2, np.nan), where=ok)
+    return {
+        "cv_x":  gx * inv,
+        "cv_y":  gy * inv,
+        "speed": np.sqrt(inv, out=inv, where=ok),
+    }
+
+
+def phase_singularities(
+    u: np.ndarray,
+    v: np.ndarray,
+    v_c: float = 0.13,
+    v_v: float = 0.04,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Phase singularities of the (u, v) phase field by topological charge.
+
+    The phase is θ = atan2(v − v_v, u − v_c). Around every 2×2 plaquette the
+    wrapped phase differences are summed; a circulation of ±2π marks a
+    singularity at the plaquette centre. Fully vectorized: O(N²) with no
+    per-tip work.
+
+    Returns (tips, charges): tips is (n, 2) float (row, col) positions in
+    grid units, charges is (n,) int (+1 / −1 for the rotation sense).
+    """
+    theta = np.arctan2(v - v_v, u - v_c)
+    two_pi = 2 * np.pi
+    dh = np.diff(theta, axis=1)   # (H, W−1): θ[i, j+1] − θ[i, j]
+    dv = np.diff(theta, axis=0)   # (H−1, W): θ[i+1, j] − θ[i, j]
+    dh = (dh + np.pi) % two_pi - np.pi
+    dv = (dv + np.pi) % two_pi - np.pi
+    # Counter-clockwise in (col, row): right, down, left, up
+    circulation = dh[:-1, :] + dv[:, 1:] - dh[1:, :] - dv[:, :-1]
+    charge = np.rint(circulation / two_pi).astype(int)
+    rows, cols = np.nonzero(charge)
+    tips = np.column_stack([rows + 0.5, cols + 0.5]) if len(rows) else np.empty((0, 2))
+    return tips, charge[rows, cols]
+
+
 def detect_spiral_tips(u: np.ndarray, v: np.ndarray,
                         v_c: float = 0.13, v_v: float = 0.04) -> np.ndarray:
-    from scipy.ndimage import gaussian_filter, label
-    dist = np.sqrt((u - v_c) ** 2 + (v - v_v) ** 2)
-    mask = gaussian_filter((dist < 0.05).astype(float), sigma=2.0) > 0.3
-    labeled, n = label(mask)
-    tips = [np.argwhere(labeled == i).mean(axis=0) for i in range(1, n + 1)]
-    return np.array(tips) if tips else np.empty((0, 2))
+    """Spiral tip (row, col) positions; see phase_singularities()."""
+    return phase_singularities(u, v, v_c, v_v)[0]
+
+
+class TipTracker:
+    """
+    Link spiral tips across frames into trajectories.
+
+    Tips of the previous frame are bucketed in a spatial hash with cell size
+    max_dist, so each new tip is compared only with the tips in its 3×3
+    neighbourhood of cells; matches (same charge, distance ≤ max_dist) are
+    assigned greedily, nearest first. A trajectory survives up to max_gap
+    frames without a match. Feed it detected tips with update(), or use it
+    as a solver sink: tracker(t, {"u": u, "v": v, ...}).
+
+    stats() reports wavebreak (tip births after the first frame) and
+    meander statistics (lifetime, path length, speed, radius of gyration).
+    """
+
+    def __init__(self, max_dist: float = 3.0, max_gap: int = 0,
+                 v_c: float = 0.13, v_v: float = 0.04):
+        self.max_dist = max_dist
+        self.max_gap = max_gap
+        self.v_c, self.v_v = v_c, v_v
+        self._tracks: list[list[tuple[float, float, float]]] = []
+        self._charge: list[int] = []
+        self._last_frame: list[int] = []
+        self._active: list[int] = []
+        self._frame = -1
+        self.times: list[float] = []
+
+    def _cell(self, p) -> tuple[int, int]:
+        return int(p[0] // self.max_dist), int(p[1] // self.max_dist)
+
+    def update(self, t: float, tips: np.ndarray, charges: Optional[np.ndarray] = None) -> None:
+        self._frame += 1
+        self.times.append(t)
+        if charges is None:
+            charges = np.zeros(len(tips), dtype=int)
+        self._active = [k for k in self._active
+                        if self._frame - self._last_frame[k] <= self.max_gap + 1]
+
+        grid: dict[tuple[int, int], list[int]] = {}
+        for k in self._active:
+            grid.setdefault(self._cell(self._tracks[k][-1][1:]), []).append(k)
+
+        pairs = []
+        for i, p in enumerate(tips):
+            ci, cj = self._cell(p)
+            for di in (-1, 0, 1):
+                for dj in (-1, 0, 1):
+                    for k in grid.get((ci + di, cj + dj), ()):
+                        if self._charge[k] != charges[i]:
+                            continue
+                        _, y, x = self._tracks[k][-1]
+                        d = np.hypot(p[0] - y, p[1] - x)
+                        if d <= self.max_dist:
+                            pairs.append((d, i, k))
+
+        matched_tips, matched_tracks = set(), set()
+        for _, i, k in sorted(pairs):
+            if i in matched_tips or k in matched_tracks:
+                continue
+            matched_tips.add(i); matched_tracks.add(k)
+            self._tracks[k].append((t, float(tips[i][0]), float(tips[i][1])))
+            self._last_frame[k] = self._frame
+
+        for i, p in enumerate(tips):
+            if i not in matched_tips:
+                self._tracks.append([(t, float(p[0]), float(p[1]))])
+                self._charge.append(int(charges[i]))
+                self._last_frame.append(self._frame)
+                self._active.append(len(self._tracks) - 1)
+
+    def __call__(self, t: float, frame: dict[str, np.ndarray]) -> None:
+        self.update(t, *phase_singularities(frame["u"], frame["v"], self.v_c, self.v_v))
+
+    def trajectories(self) -> list[np.ndarray]:
+        """One (n, 3) array of (t, row, col) per trajectory."""
+        return [np.array(tr) for tr in self._tracks]
+
+    def stats(self, dx: float = 1.0) -> dict[str, float]:
+        """Wavebreak and meander statistics; lengths are scaled by dx."""
+        trajs = self.trajectories()
+        if not trajs:
+            return {"n_trajectories": 0, "n_births": 0, "wavebreak_rate": 0.0,
+                    "mean_lifetime": float("nan"), "mean_path_length": float("nan"),
+                    "mean_tip_speed": float("nan"), "mean_gyration_radius": float("nan")}
+        t_first = self.times[0]
+        duration = self.times[-1] - t_first
+        births = sum(1 for tr in trajs if tr[0, 0] > t_first)
+        lifetimes = np.array([tr[-1, 0] - tr[0, 0] for tr in trajs])
+        paths = np.array([np.hypot(*np.diff(tr[:, 1:], axis=0).T).sum() * dx for tr in trajs])
+        gyration = np.array([
+            np.sqrt(((tr[:, 1:] - tr[:, 1:].mean(axis=0)) ** 2).sum(axis=1).mean()) * dx
+            for tr in trajs
+        ])
+        moving = lifetimes > 0
+        return {
+            "n_trajectories":       len(trajs),
+            "n_births":             births,
+            "wavebreak_rate":       births / duration if duration > 0 else 0.0,
+            "mean_lifetime":        float(lifetimes.mean()),
+            "mean_path_length":     float(paths.mean()),
+            "mean_tip_speed":       float((paths[moving] / lifetimes[moving]).mean())
+                                    if moving.any() else float("nan"),
+            "mean_gyration_radius": float(gyration.mean()),
+        }
+
+
+def default_electrodes(
+    shape: tuple[int, int],
+    dx: float = 0.0390625,
+    height: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Five virtual electrodes (x, y, z): the centre and the four quadrant
+    centres of the tissue, at height (default 10% of the shorter side).
+    """
+    Ly, Lx = shape[0] * dx, shape[1] * dx
+    z = 0.1 * min(Lx, Ly) if height is None else height
+    fr = [(0.5, 0.5), (0.25, 0.25), (0.75, 0.25), (0.25, 0.75), (0.75, 0.75)]
+    return np.array([(fx * Lx, fy * Ly, z) for fx, fy in fr])
+
+
+class PseudoECG:
+    """
+    Pseudo-ECG of a 2D voltage field for a set of virtual electrodes:
+
+        φ_e(t) = ∫ ∇u · ∇(1/r_e) dA
+
+    Discretised over grid edges this is Σ (u_i − u_j)(w_i − w_j) with
+    w = 1/r_e, which equals u · (G w), G the graph Laplacian of the grid
+    (no-flux boundaries). The lead-field weights G w are precomputed once
+    per electrode, so each frame is a single [N] × [N, E] dot product and
+    a [T, N] stack is one matrix product.
+
+    electrodes : (E, 3) positions (x, y, z) in the units of dx, with x along
+                 columns and y along rows; (E, 2) positions get z = height.
+                 Electrodes must be above the tissue (z > 0).
+
+    Also usable as a frame sink: ecg(t, {"u": u, ...}) records φ(t); see
+    trace().
+    """
+
+    def __init__(
+        self,
+        shape: tuple[int, int],
+        electrodes: np.ndarray,
+        dx: float = 0.0390625,
+        height: float = 1.0,
+        var: str = "u",
+    ):
+        e = np.atleast_2d(np.asarray(electrodes, dtype=np.float64))
+        if e.shape[1] == 2:
+            e = np.column_stack([e, np.full(len(e), height)])
+        if np.any(e[:, 2] <= 0):
+            raise ValueError("PseudoECG electrodes must be above the tissue (z > 0)")
+        self.shape = tuple(shape)
+        self.electrodes = e
+        self.var = var
+
+        H, W = self.shape
+        x = np.arange(W) * dx
+        y = np.arange(H) * dx
+        r = np.sqrt((x[None, None, :] - e[:, 0, None, None]) ** 2
+                    + (y[None, :, None] - e[:, 1, None, None]) ** 2
+                    + e[:, 2, None, None] ** 2)
+        w = 1.0 / r                                      # (E, H, W)
+        gw = np.zeros_like(w)
+        dh = np.diff(w, axis=2)
+        gw[:, :, :-1] -= dh
+        gw[:, :, 1:] += dh
+        dv = np.diff(w, axis=1)
+        gw[:, :-1, :] -= dv
+        gw[:, 1:, :] += dv
+        self.weights = np.ascontiguousarray(gw.reshape(len(e), -1).T)  # (N, E)
+        self.times: list[float] = []
+        self._samples: list[np.ndarray] = []
+
+    def frame(self, u: np.ndarray) -> np.ndarray:
+        """φ for one frame: (E,)."""
+        return u.reshape(-1) @ self.weights
+
+    def signals(self, frames, chunk_frames: int = 64) -> np.ndarray:
+        """
+        ECG [T, E] of a [T, H, W] stack (read chunk_frames at a time) or of
+        a snapshot dict {t: {var: [H, W]}} in time order.
+        """
+        if isinstance(frames, dict):
+            rows = [self.frame(frames[t][self.var]) for t in sorted(frames)]
+            return np.array(rows).reshape(-1, len(self.electrodes))
+        T = frames.shape[0]
+        out = np.empty((T, len(self.electrodes)))
+        for a in range(0, T, chunk_frames):
+            block = np.asarray(frames[a:a + chunk_frames], dtype=np.float64)
+            out[a:a + len(block)] = block.reshape(len(block), -1) @ self.weights
+        return out
+
+    def __call__(self, t: float, frame: dict[str, np.ndarray]) -> None:
+        self.times.append(round(t, 6))
+        self._samples.append(self.frame(frame[self.var]))
+
+    def trace(self) -> tuple[np.ndarray, np.ndarray]:
+        """(times [T], φ [T, E]) recorded through the sink interface."""
+        return np.array(self.times), np.array(self._samples).reshape(-1, len(self.electrodes))
+
+
+def ecg_error(pred_ecg: np.ndarray, gt_ecg: np.ndarray) -> dict[str, float]:
+    """
+    Compare pseudo-ECGs [T, E]: RMSE and relative L2 over all samples, and
+    the Pearson correlation averaged over electrodes (NaN for flat traces).
+    """
+    if pred_ecg.size == 0 or pred_ecg.shape != gt_ecg.shape:
+        return {"ecg_rmse": float("nan"), "ecg_l2": float("nan"), "ecg_corr": float("nan")}
+    d = pred_ecg - gt_ecg
+    p = pred_ecg - pred_ecg.mean(axis=0)
+    g = gt_ecg - gt_ecg.mean(axis=0)
+    denom = np.sqrt((p * p).sum(axis=0) * (g * g).sum(axis=0))
+    corr = np.divide((p * g).sum(axis=0), denom, out=np.full(denom.shape, np.nan), where=denom > 0)
+    return {
+        "ecg_rmse": float(np.sqrt(np.mean(d * d))),
+        "ecg_l2":   float(np.linalg.norm(d) / (np.linalg.norm(gt_ecg) + 1e-10)),
+        "ecg_corr": float(np.nanmean(corr)) if np.isfinite(corr).any() else float("nan"),
+    }
+
+
+def _spectral_block(
+    x: np.ndarray,
+    freqs: np.ndarray,
+    band: np.ndarray,
+    n_harmonics: int,
+    half_bins: int,
+    window: Optional[np.ndarray],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """DF, OI and summed power spectrum of a [T, n] block of pixel traces."""
+    x = x - x.mean(axis=0)
+    if window is not None:
+        x *= window[:, None]
+    power = np.abs(np.fft.rfft(x, axis=0)) ** 2        # [F, n]
+    power[~band] = 0.0
+    n_freq = power.shape[0]
+    peak = np.argmax(power, axis=0)                    # [n]
+    total = power.sum(axis=0)
+
+    # Power in ±half_bins around the DF and its harmonics via a prefix sum
+    csum = np.concatenate([np.zeros((1, power.shape[1])), np.cumsum(power, axis=0)])
+    peak_power = np.zeros(power.shape[1])
+    for h in range(1, n_harmonics + 1):
+        centre = peak * h
+        lo = centre - half_bins
+        if h > 1:
+            # Never count a bin twice when harmonic windows overlap
+            lo = np.maximum(lo, peak * (h - 1) + half_bins + 1)
+        lo = np.clip(lo, 0, n_freq)
+        hi = np.clip(centre + half_bins + 1, lo, n_freq)
+        peak_power += (np.take_along_axis(csum, hi[None], axis=0)[0]
+                       - np.take_along_axis(csum, lo[None], axis=0)[0])
+
+    flat = total <= 0
+    df = freqs[peak].astype(np.float64)
+    df[flat] = np.nan
+    oi = np.divide(peak_power, total, out=np.full_like(total, np.nan), where=~flat)
+    return df, oi, power.sum(axis=1)
+
+
+def dominant_frequency_maps(
+    u_stack: np.ndarray,
+    dt: float,
+    gt_stack: Optional[np.ndarray] = None,
+    stride: int = 1,
+    f_band: Optional[tuple[float, float]] = None,
+    n_harmonics: int = 3,
+    peak_halfwidth: Optional[float] = None,
+    hann: bool = True,
+    max_block_bytes: int = 128 * 1024 ** 2,
+) -> dict:
+    """
+    Dominant-frequency (DF) and organization-index (OI) maps of a [T, H, W]
+    stack sampled every dt. Frequencies are in cycles per time unit.
+
+    Each pixel trace is mean-removed, optionally Hann-windowed and
+    transformed with a real FFT along time. DF is the peak frequency within
+    f_band (default: everything above DC); OI is the power within
+    ±peak_halfwidth (default: 2 bins) of the DF and its first n_harmonics−1
+    harmonics, over the total in-band power. stride > 1 keeps only every
+    stride-th pixel along each spatial axis (probe downsampling).
+
+    The grid is processed in row blocks of at most max_block_bytes of
+    traces, so memory is bounded for long series; u_stack may be a
+    np.memmap or h5py dataset.
+
+    Returns {"df", "oi", "freqs", "spectrum"} where spectrum is the
+    pixel-averaged power spectrum. If gt_stack is given the same maps are
+    computed for it and the comparison is added:
+      gt_df, gt_oi, gt_spectrum,
+      df_mae      mean |DF_pred − DF_gt| over pixels where both are defined
+      oi_mae      mean |OI_pred − OI_gt|
+      spectrum_distance  total-variation distance between the normalised
+                         mean spectra (0 = identical shape, 1 = disjoint)
+    """
+    T = u_stack.shape[0]
+    freqs = np.fft.rfftfreq(T, d=dt)
+    lo_f, hi_f = f_band if f_band is not None else (0.0, np.inf)
+    band = (freqs >= lo_f) & (freqs <= hi_f) & (freqs > 0)
+    df_bin = freqs[1] - freqs[0] if len(freqs) > 1 else 1.0
+    half_bins = 2 if peak_halfwidth is None else int(round(peak_halfwidth / df_bin))
+    window = np.hanning(T) if hann else None
+
+    def maps(stack):
+        H, W = stack.shape[1], stack.shape[2]
+        out_h, out_w = len(range(0, H, stride)), len(range(0, W, stride))
+        df = np.empty((out_h, out_w))
+        oi = np.empty((out_h, out_w))
+        spectrum = np.zeros(len(freqs))
+        # Traces, FFT output and power: roughly 4 float64 copies per pixel
+        rows_per = max(1, max_block_bytes // (4 * 8 * T * out_w))
+        for r0 in range(0, out_h, rows_per):
+            r1 = min(r0 + rows_per, out_h)
+            block = np.asarray(stack[:, r0 * stride:(r1 - 1) * stride + 1:stride, ::stride],
+                               dtype=np.float64)
+            d, o, p = _spectral_block(block.reshape(T, -1), freqs, band,
+                                      n_harmonics, half_bins, window)
+            df[r0:r1] = d.reshape(r1 - r0, out_w)
+            oi[r0:r1] = o.reshape(r1 - r0, out_w)
+            spectrum += p
+        return df, oi, spectrum / (out_h * out_w)
+
+    df, oi, spectrum = maps(u_stack)
+    result = {"df": df, "oi": oi, "freqs": freqs, "spectrum": spectrum}
+    if gt_stack is None:
+        return result
+
+    gt_df, gt_oi, gt_spectrum = maps(gt_stack)
+    p_norm = spectrum / spectrum.sum() if spectrum.sum() > 0 else spectrum
+    g_norm = gt_spectrum / gt_spectrum.sum() if gt_spectrum.sum() > 0 else gt_spectrum
+    both = np.isfinite(df) & np.isfinite(gt_df)
+    result.update({
+        "gt_df": gt_df, "gt_oi": gt_oi, "gt_spectrum": gt_spectrum,
+        "df_mae": float(np.mean(np.abs(df - gt_df)[both])) if both.any() else float("nan"),
+        "oi_mae": float(np.mean(np.abs(oi - gt_oi)[both])) if both.any() else float("nan"),
+        "spectrum_distance": float(0.5 * np.abs(p_norm - g_norm).sum()),
+    })
+    return result
 
 
 # ============================================================
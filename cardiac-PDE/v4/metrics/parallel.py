@@ -0,0 +1,165 @@
+"""
+metrics/parallel.py — Process-pool accuracy evaluation over shared memory.
+
+Scoring several methods (and samples) one after another is serial in
+full_accuracy_suite(). ParallelEvaluator stacks each entry's predicted and
+ground-truth snapshots into [T, V, *spatial] arrays in shared memory, then
+fans out (entry, time-chunk) jobs to a process pool. Workers attach to the
+shared blocks by name — no array is pickled — and return only per-frame
+metric values, which are merged into the same dict full_accuracy_suite()
+returns (values are identical: both use frame_errors() and ssim_batch()
+per frame, and each side is stacked at its snapshots' own dtype, so f32
+ground truth is neither upcast nor doubled in memory).
+
+    ev = ParallelEvaluator(meta.var_names, n_workers=4)
+    ev.add(("LLM-direct", 0), pred_snaps, gt_snaps)
+    ev.add(("OpInf-LLM", 0), opinf_snaps, gt_snaps)
+    results = ev.run()          # {key: accuracy dict}
+"""
+
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Hashable, Optional
+
+import numpy as np
+
+from metrics.metrics import _summarise_per_var, frame_errors, full_accuracy_suite, ssim_batch
+
+_METRICS = ("rmse", "l2", "mae", "ssim")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to a block created (and later unlinked) by the parent."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python ≥ 3.13
+    except TypeError:
+        # Older Pythons register the name again with the resource tracker,
+        # which pool workers share with the parent; the parent's unlink()
+        # clears that single registration.
+        return shared_memory.SharedMemory(name=name)
+
+
+def _score_chunk(pred: np.ndarray, gt: np.ndarray) -> dict[str, np.ndarray]:
+    spatial_ndim = pred.ndim - 2
+    errs = frame_errors(pred, gt, spatial_ndim=spatial_ndim)
+    errs["ssim"] = ssim_batch(pred, gt, spatial_ndim=spatial_ndim)
+    return errs
+
+
+def _chunk_job(spec: dict) -> tuple[int, int, dict[str, np.ndarray]]:
+    """Score frames [t0, t1) of one shared-memory entry in a worker process."""
+    blocks = [_attach(spec["pred"]), _attach(spec["gt"])]
+    try:
+        t0, t1 = spec["t0"], spec["t1"]
+        pred, gt = (np.ndarray(spec["shape"], dtype=dtype, buffer=b.buf)[t0:t1]
+                    for b, dtype in zip(blocks, spec["dtypes"]))
+        errs = _score_chunk(pred, gt)
+        del pred, gt  # release the buffer views before closing
+        return spec["entry"], t0, errs
+    finally:
+        for shm in blocks:
+            shm.close()
+
+
+class ParallelEvaluator:
+    """
+    Collect (key, pred_snaps, gt_snaps) entries with add(), score them all
+    with run(). Frames are split into chunks of chunk_frames per job.
+    n_workers <= 1 runs the same chunks in-process on ordinary arrays.
+    Entries whose snapshots do not carry every variable at every shared
+    time fall back to full_accuracy_suite().
+    """
+
+    def __init__(
+        self,
+        var_names: list[str],
+        n_workers: Optional[int] = None,
+        chunk_frames: int = 8,
+    ):
+        self.var_names = list(var_names)
+        self.n_workers = n_workers if n_workers is not None else (os.cpu_count() or 1)
+        self.chunk_frames = chunk_frames
+        self._entries: list[tuple[Hashable, dict, dict]] = []
+
+    def add(self, key: Hashable, pred_snaps: dict, gt_snaps: dict) -> None:
+        self._entries.append((key, pred_snaps, gt_snaps))
+
+    def _stackable(self, pred_snaps: dict, gt_snaps: dict) -> list[float]:
+        shared = sorted(set(pred_snaps) & set(gt_snaps))
+        complete = all(v in pred_snaps[t] and v in gt_snaps[t]
+                       for t in shared for v in self.var_names)
+        return shared if shared and complete else []
+
+    def _dtype(self, snaps: dict, times: list[float]) -> np.dtype:
+        """Common dtype of the stacked frames (their own, as full_accuracy_suite() sees them)."""
+        return np.result_type(*(snaps[t][v] for t in times for v in self.var_names))
+
+    def _fill(self, arr: np.ndarray, snaps: dict, times: list[float]) -> None:
+        for k, t in enumerate(times):
+            for j, v in enumerate(self.var_names):
+                arr[k, j] = snaps[t][v]
+
+    def run(self) -> dict[Hashable, dict[str, float]]:
+        results: dict[Hashable, dict[str, float]] = {}
+        stacked = {}
+        for entry, (key, pred_snaps, gt_snaps) in enumerate(self._entries):
+            times = self._stackable(pred_snaps, gt_snaps)
+            if times:
+                stacked[entry] = times
+            else:
+                results[key] = full_accuracy_suite(pred_snaps, gt_snaps, self.var_names)
+
+        n_jobs = sum(-(-len(times) // self.chunk_frames) for times in stacked.values())
+        use_pool = self.n_workers > 1 and n_jobs > 1
+        per_entry = {e: {m: np.empty((len(times), len(self.var_names))) for m in _METRICS}
+                     for e, times in stacked.items()}
+        blocks: list[shared_memory.SharedMemory] = []
+        try:
+            specs, outputs = [], []
+            for entry, times in stacked.items():
+                _, pred_snaps, gt_snaps = self._entries[entry]
+                first = pred_snaps[times[0]][self.var_names[0]]
+                shape = (len(times), len(self.var_names)) + first.shape
+                arrays, names = [], []
+                dtypes = [self._dtype(snaps, times) for snaps in (pred_snaps, gt_snaps)]
+                for snaps, dtype in zip((pred_snaps, gt_snaps), dtypes):
+                    if use_pool:
+                        size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+                        shm = shared_memory.SharedMemory(create=True, size=size)
+                        blocks.append(shm)
+                        names.append(shm.name)
+                        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+                    else:
+                        arr = np.empty(shape, dtype=dtype)
+                    self._fill(arr, snaps, times)
+                    arrays.append(arr)
+                for t0 in range(0, len(times), self.chunk_frames):
+                    t1 = min(t0 + self.chunk_frames, len(times))
+                    if use_pool:
+                        specs.append({"entry": entry, "pred": names[0], "gt": names[1],
+                                      "shape": shape, "dtypes": [d.str for d in dtypes],
+                                      "t0": t0, "t1": t1})
+                    else:
+                        errs = _score_chunk(arrays[0][t0:t1], arrays[1][t0:t1])
+                        outputs.append((entry, t0, errs))
+                del arrays
+
+            if use_pool:
+                with ProcessPoolExecutor(max_workers=min(self.n_workers, n_jobs)) as pool:
+                    outputs = list(pool.map(_chunk_job, specs))
+
+            for entry, t0, errs in outputs:
+                for m in _METRICS:
+                    per_entry[entry][m][t0:t0 + len(errs[m])] = errs[m]
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+        for entry, vals in per_entry.items():
+            per_var = {v: {m: np.ascontiguousarray(vals[m][:, j]) for m in _METRICS}
+                       for j, v in enumerate(self.var_names)}
+            results[self._entries[entry][0]] = _summarise_per_var(per_var, self.var_names)
+        return results
@@ -0,0 +1,212 @@
+"""
+metrics/streaming.py — Online accuracy metrics, fed one frame at a time.
+
+full_accuracy_suite() / method_summary() need every predicted and
+ground-truth snapshot in memory. The accumulators here keep only running
+sums, maxima and counts, so a solver (or a browser readback loop) can hand
+over each frame as soon as it is produced and the metrics are ready the
+moment the run ends. Memory is O(one frame) regardless of run length.
+
+  RunningMoments      count / mean / variance of a value stream (Welford,
+                      merged a whole frame at a time)
+  VariableAccumulator RMSE, L2, MaxAE, SSIM of one variable, per-frame means
+                      plus run-wide error statistics
+  OnlineEvaluator     sink(t, frame) callable over all variables; result()
+                      and summary() mirror full_accuracy_suite() and
+                      method_summary() (equal up to summation order),
+                      optionally with pseudo-ECG errors
+
+Example
+-------
+    evaluator = OnlineEvaluator(gt_snaps, meta.var_names)
+    _, perf = FentonKarmaSolver().run(ic, t_end, sample_times, sink=evaluator)
+    row = evaluator.summary(perf)
+"""
+
+from __future__ import annotations
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+from metrics.metrics import (
+    PseudoECG, ValidityReport, ecg_error, frame_errors, ssim, validity_report,
+)
+
+Frame = dict[str, np.ndarray]
+# Ground truth: snapshots keyed by time, or a callable t → frame (None if absent)
+GroundTruth = Union[dict[float, Frame], Callable[[float], Optional[Frame]]]
+
+
+class RunningMoments:
+    """Count, mean and variance of a stream of values, updated in batches."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, values: np.ndarray) -> None:
+        """Merge a batch of values (Chan et al. parallel Welford update)."""
+        x = np.asarray(values, dtype=np.float64).ravel()
+        n = x.size
+        if n == 0:
+            return
+        mean_b = float(x.sum()) / n
+        dev = x - mean_b
+        m2_b = float(np.dot(dev, dev))
+        total = self.count + n
+        delta = mean_b - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2_b + delta * delta * self.count * n / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count else float("nan")
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+
+class VariableAccumulator:
+    """
+    Running accuracy statistics for one variable.
+
+    Per-frame RMSE, relative L2, MaxAE and SSIM are summed so their means
+    match full_accuracy_suite(); the squared-error / squared-norm totals,
+    the overall max error and the error moments describe the whole run.
+    """
+
+    def __init__(self, data_range: float = 1.0):
+        self.data_range = data_range
+        self.n_frames = 0
+        self.sums = {"rmse": 0.0, "l2": 0.0, "mae": 0.0, "ssim": 0.0}
+        self.sq_err = 0.0
+        self.sq_gt = 0.0
+        self.max_abs_err = 0.0
+        self.error = RunningMoments()
+
+    def update(self, pred: np.ndarray, gt: np.ndarray) -> None:
+        # Per-frame metrics from the same fused kernel full_accuracy_suite() uses
+        errs = frame_errors(pred, gt, spatial_ndim=np.ndim(pred))
+        for k in ("rmse", "l2", "mae"):
+            self.sums[k] += float(errs[k])
+        self.sums["ssim"] += ssim(pred, gt, data_range=self.data_range)
+        self.n_frames += 1
+        self.max_abs_err = max(self.max_abs_err, float(errs["mae"]))
+
+        d = (pred - gt).ravel()
+        g = np.asarray(gt, dtype=np.float64).ravel()
+        self.sq_err += float(np.dot(d, d))
+        self.sq_gt += float(np.dot(g, g))
+        self.error.update(d)
+
+    def means(self) -> dict[str, float]:
+        """Per-frame metrics averaged over frames (NaN before any update)."""
+        if not self.n_frames:
+            return {k: float("nan") for k in self.sums}
+        return {k: s / self.n_frames for k, s in self.sums.items()}
+
+    def run_stats(self) -> dict[str, float]:
+        """Statistics of the pointwise error over every frame seen so far."""
+        n = self.error.count
+        return {
+            "rmse_run":  float(np.sqrt(self.sq_err / n)) if n else float("nan"),
+            "l2_run":    float(np.sqrt(self.sq_err) / (np.sqrt(self.sq_gt) + 1e-10)) if n else float("nan"),
+            "mae_run":   self.max_abs_err if n else float("nan"),
+            "err_mean":  self.error.mean if n else float("nan"),
+            "err_std":   self.error.std,
+            "n_frames":  self.n_frames,
+        }
+
+
+class OnlineEvaluator:
+    """
+    Frame sink that scores predictions against ground truth as they arrive.
+
+    Call it as evaluator(t, {"u": u, ...}) — the signature solvers use for
+    their sink argument. Times are rounded to 6 decimals, as snapshot keys
+    are everywhere else. Frames without ground truth still count towards
+    the validity check (is_physically_valid semantics) but not accuracy.
+    With a PseudoECG, the ECG of each scored frame is recorded (E floats
+    per frame) and result() adds the ecg_error() keys.
+    """
+
+    def __init__(
+        self,
+        gt: GroundTruth,
+        var_names: list[str],
+        valid_range: tuple[float, float] = (0.0, 1.0),
+        data_range: float = 1.0,
+        ecg: Optional[PseudoECG] = None,
+    ):
+        self._gt = gt
+        self.ecg = ecg
+        self._ecg_pred: list[np.ndarray] = []
+        self._ecg_gt: list[np.ndarray] = []
+        self.var_names = list(var_names)
+        self.valid_range = valid_range
+        self.vars = {v: VariableAccumulator(data_range) for v in self.var_names}
+        self.n_frames = 0
+        self._report = ValidityReport(True)  # first violation, once one is seen
+
+    def _gt_frame(self, t: float) -> Optional[Frame]:
+        if callable(self._gt):
+            return self._gt(t)
+        return self._gt.get(t)
+
+    def __call__(self, t: float, frame: Frame) -> None:
+        t = round(t, 6)
+        self.n_frames += 1
+        if self._report:
+            # The same chunked, early-exit scan is_physically_valid() runs
+            self._report = validity_report({t: frame}, self.var_names, self.valid_range)
+
+        gt_frame = self._gt_frame(t)
+        if gt_frame is None:
+            return
+        for v in self.var_names:
+            if v in frame and v in gt_frame:
+                self.vars[v].update(frame[v], gt_frame[v])
+        if self.ecg is not None and self.ecg.var in frame and self.ecg.var in gt_frame:
+            self._ecg_pred.append(self.ecg.frame(frame[self.ecg.var]))
+            self._ecg_gt.append(self.ecg.frame(gt_frame[self.ecg.var]))
+
+    @property
+    def valid(self) -> bool:
+        """True if at least one frame arrived and all were finite and in range."""
+        return self._report.valid and self.n_frames > 0
+
+    @property
+    def report(self) -> ValidityReport:
+        """validity_report() of the frames seen so far (its first violation)."""
+        if not self.n_frames:
+            return ValidityReport(False, "no snapshots produced")
+        return self._report
+
+    def result(self) -> dict[str, float]:
+        """Same keys as full_accuracy_suite(), plus ecg_* with a PseudoECG."""
+        result = {}
+        for v, acc in self.vars.items():
+            for name, val in acc.means().items():
+                result[f"{name}_{v}"] = val
+        result["rmse_mean"] = float(np.nanmean([result[f"rmse_{v}"] for v in self.var_names]))
+        result["l2_mean"]   = float(np.nanmean([result[f"l2_{v}"]   for v in self.var_names]))
+        if self.ecg is not None:
+            result.update(ecg_error(np.array(self._ecg_pred), np.array(self._ecg_gt)))
+        return result
+
+    def run_stats(self) -> dict[str, float]:
+        """Run-wide error statistics, keyed <stat>_<var>."""
+        return {f"{k}_{v}": val for v, acc in self.vars.items() for k, val in acc.run_stats().items()}
+
+    def summary(self, perf: dict, is_bug_free: Optional[bool] = None) -> dict:
+        """method_summary() equivalent; bug_free defaults to the validity check."""
+        return {
+            **self.result(),
+            "bug_free":    self.valid if is_bug_free is None else is_bug_free,
+            "wall_time_s": perf.get("wall_time_s", float("nan")),
+            "peak_mem_mb": perf.get("peak_mem_mb", float("nan")),
+            "fps":         perf.get("fps", None),
+        }
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Tests import the framework packages (data, metrics, baselines) as the
+# pipeline does, relative to v4/
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,43 @@
+"""OpInfLLMBaseline.sweep() on small synthetic trajectories."""
+
+import numpy as np
+
+from baselines.opinf_llm import OpInfLLMBaseline
+from data.base import DatasetMetadata
+
+N = 16
+TIMES = [round(0.1 * k, 6) for k in range(51)]
+
+
+def _trajectory(seed):
+    # u: two fixed profiles (rank 2 < r), first in the coupled state;
+    # v: decaying mix of several modes
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0.0, 1.0, N)
+    modes = np.stack([np.sin((k + 1) * np.pi * x) for k in range(6)])
+    amp = rng.random(6)
+    profile = 0.5 + 0.4 * np.cos(np.pi * x)
+    return {t: {"u": profile * np.exp(-0.2 * t) + 0.1 * np.cos(2 * np.pi * x) * np.exp(-t),
+                "v": 0.5 + 0.1 * (amp * np.exp(-(np.arange(6) + 1) * t)) @ modes}
+            for t in TIMES}
+
+
+def _meta():
+    return DatasetMetadata(name="synthetic", n_vars=2, var_names=["u", "v"],
+                           spatial_shape=(N,), n_time_steps=len(TIMES), t_start=0.0,
+                           t_end=TIMES[-1], dt=0.1, dx=1.0 / N, domain_size=1.0)
+
+
+def test_coupled_sweep_rank_deficient_variable():
+    train, val = [_trajectory(s) for s in range(3)], [_trajectory(3)]
+    model = OpInfLLMBaseline(r=6, coupled=True, pod_method="snapshots")
+    rows = model.sweep(train, _meta(), r_values=[3, 6], regularisations=[1e-3, 1e-2],
+                       validation=val)
+
+    assert model.basis_["u"].shape[1] == 2
+    assert len(rows) == 4
+    for row in rows:
+        assert np.isfinite(row["train_residual"])
+        assert np.isfinite([row["val_rel_l2"], row["val_rel_l2_u"], row["val_rel_l2_v"]]).all()
+    best = min(rows, key=lambda row: row["val_rel_l2"])
+    assert (model.r, model.regularisation) == (best["r"], best["regularisation"])
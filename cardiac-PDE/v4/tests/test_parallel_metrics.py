@@ -0,0 +1,33 @@
+"""ParallelEvaluator must score exactly as full_accuracy_suite()."""
+
+import numpy as np
+import pytest
+
+from metrics.metrics import full_accuracy_suite
+from metrics.parallel import ParallelEvaluator
+
+VARS = ["u", "v", "w"]
+
+
+def _snaps(rng, dtype, noise=0.0, base=None):
+    times = [round(0.5 * k, 6) for k in range(5)]
+    out = {}
+    for t in times:
+        frame = {}
+        for v in VARS:
+            a = rng.random((24, 24)) if base is None else base[t][v] + noise * rng.standard_normal((24, 24))
+            frame[v] = np.clip(a, 0, 1).astype(dtype)
+        out[t] = frame
+    return out
+
+
+@pytest.mark.parametrize("pred_dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_matches_full_accuracy_suite_float32_gt(pred_dtype, n_workers):
+    rng = np.random.default_rng(0)
+    gt = _snaps(rng, np.float32)
+    pred = _snaps(rng, pred_dtype, noise=0.05, base=gt)
+
+    ev = ParallelEvaluator(VARS, n_workers=n_workers, chunk_frames=2)
+    ev.add("m", pred, gt)
+    assert ev.run()["m"] == full_accuracy_suite(pred, gt, VARS)
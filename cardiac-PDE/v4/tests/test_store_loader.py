@@ -0,0 +1,58 @@
+"""Roundtrip checks for data/store_loader.py on a miniature FK dataset."""
+
+import numpy as np
+import pytest
+
+from data.fk_loader import FK_SNAPSHOT_TIMES, FKDataLoader
+from data.store_loader import StoreLoader, write_store
+
+N = 8
+
+
+def _fk_dir(tmp_path, seed=0):
+    rng = np.random.default_rng(seed)
+    sub = tmp_path / "fk" / "tau_d_0.5714"
+    sub.mkdir(parents=True)
+    np.savetxt(sub / "IC.csv", rng.random((N * N, 4)), delimiter=",")
+    T = len(FK_SNAPSHOT_TIMES)
+    np.savez(sub / "UVW_array_data.npz", **{k: rng.random((T, N, N)) for k in "UVW"})
+    return FKDataLoader(data_dir=str(tmp_path / "fk"), n=N)
+
+
+def test_fk_store_roundtrip(tmp_path):
+    src = _fk_dir(tmp_path)
+    store = StoreLoader(str(write_store(tmp_path / "fk.h5", src)))
+
+    ic, ic_src = store.load_ic(0), src.load_ic(0)
+    assert set(ic) == {"u", "v", "w"}
+    for v in ic:
+        np.testing.assert_array_equal(ic[v], ic_src[v])
+    # The FK IC is not the first snapshot (t=831.25)
+    assert not np.array_equal(ic["u"], store.load_snapshots(0, [0])[FK_SNAPSHOT_TIMES[0]]["u"])
+
+    sl = (slice(1, 7, 2), slice(None, None, 3))
+    for v, a in store.load_ic(0, spatial=sl).items():
+        np.testing.assert_array_equal(a, ic_src[v][sl])
+
+    snaps, snaps_src = store.load_snapshots(0), src.load_snapshots(0)
+    assert list(snaps) == list(snaps_src)
+    for t in snaps:
+        for v in snaps[t]:
+            np.testing.assert_array_equal(snaps[t][v], snaps_src[t][v].astype(np.float32))
+
+
+def test_sample_digest_covers_ic(tmp_path):
+    src = _fk_dir(tmp_path)
+    path = write_store(tmp_path / "a.h5", src)
+    digest = StoreLoader(str(path)).snapshot_digest(0)
+
+    # Same snapshots, different IC
+    ic_path = src._subdir / "IC.csv"
+    np.savetxt(ic_path, np.loadtxt(ic_path, delimiter=",") + 1.0, delimiter=",")
+    other = StoreLoader(str(write_store(tmp_path / "b.h5", src))).snapshot_digest(0)
+    assert digest != other
+
+
+def test_unknown_option_rejected():
+    with pytest.raises(TypeError):
+        StoreLoader(name="pdebench")
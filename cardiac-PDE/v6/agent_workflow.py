@@ -1,6 +1,7 @@
 import pde_descriptions
 from prompts import system_prompt,parse_prompt,code_prompt,debug_prompt,refine_prompt,validate_parse_prompt
 from verify_script.verify_result import *
+from field_io import read_field, find_field
 import json
 import ollama
 import os
@@ -268,11 +269,6 @@ def code_agent(LLM:str,pde_name:str):
     return simulation_file_path
 
 def verify_agent(LLM,pde_name,simulation_file_path,IC_file_path,download_folder,log_file_path,solution_file_path): # reference data should be ref sol in r channel as 1d array
-    def load_csv(csv_path):
-        result_data = np.loadtxt(csv_path, delimiter=',')
-        # skip first two data points
-        result_data = result_data[2:]
-        return result_data
     LLM_original_name = LLM
     LLM = re.sub(r'[.\-:]', '_', LLM)
             
@@ -293,12 +289,12 @@ def verify_agent(LLM,pde_name,simulation_file_path,IC_file_path,download_folder,
         return 1e10
     else:
 
-        result = os.path.join(download_folder, "result.csv")
+        # the skeleton saves result.bin for binary ICs and result.csv otherwise
+        result = find_field(download_folder, "result")
 
-        
-        result_data = np.loadtxt(result, delimiter=',')
+        result_data = read_field(result, csv_header=False)
         result_data = result_data[::4]
-        reference_data = load_csv(solution_file_path)
+        reference_data = read_field(solution_file_path)
         reference_data = reference_data[::4]
 
         rmse = np.sqrt(np.mean((result_data - reference_data) ** 2))
@@ -466,9 +462,11 @@ def main():
             pde_paras = pickle.load(f)
         
         IC_folder = f"./data/{args.pde}/train"
-        IC_files = [f for f in os.listdir(IC_folder) if f.endswith(('.csv')) and f.startswith("IC_")] # IC_0.csv,IC_1.csv,...
+        # IC_0.bin,IC_1.bin,... (binary) or IC_0.csv,IC_1.csv,... (CSV fallback); prefer binary
+        IC_stems = sorted({os.path.splitext(f)[0] for f in os.listdir(IC_folder)
+                           if f.endswith(('.bin', '.csv')) and f.startswith("IC_")})
+        IC_files = [os.path.basename(find_field(IC_folder, stem)) for stem in IC_stems]
         solution_folder = f"./data/{args.pde}/train"
-        solution_files = [f for f in os.listdir(solution_folder) if f.endswith(('.csv')) and f.startswith("solution_")] # solution_0.csv,solution_1.csv,...
         
         # delete original parsed_response:
         os.remove(f"./result/{LLM_sanitized}/{args.pde}/parsed_resp.json") if os.path.exists(f"./result/{LLM_sanitized}/{args.pde}/parsed_resp.json") else None
@@ -484,8 +482,7 @@ def main():
             index = IC_file.split('_')[1].split('.')[0] # get 0 from IC_0.csv
             IC_file = os.path.join(IC_folder, IC_file)
             
-            solution_file = f"solution_{index}.csv"
-            solution_file = os.path.join(solution_folder, solution_file)
+            solution_file = find_field(solution_folder, f"solution_{index}")
             
             download_folder = f"./result/{LLM_sanitized}/{args.pde}/{debugged_times_used}_debug_times/IC_{index}"
             log_file_path = f"{download_folder}/log.txt"
@@ -0,0 +1,73 @@
+import os
+import numpy as np
+
+# Compact binary format for the IC / solution / result textures exchanged with
+# the WebGL skeleton. Layout (all little-endian):
+#   bytes  0..3   magic b'WPDF'
+#   bytes  4..7   uint32 width
+#   bytes  8..11  uint32 height
+#   bytes 12..15  uint32 number of float32 values that follow
+#   bytes 16..    float32 values, in the same order as the CSV files
+# The 16-byte header keeps the payload 4-byte aligned, so the browser can view
+# it with `new Float32Array(buffer, 16, count)` without copying.
+# CSV files ("width,height,v0,v1,...") remain supported as a fallback.
+
+FIELD_MAGIC = b'WPDF'
+HEADER_BYTES = 16
+
+
+def _pack_header(width, height, count):
+    header = FIELD_MAGIC + np.array([width, height, count], dtype='<u4').tobytes()
+    assert len(header) == HEADER_BYTES
+    return header
+
+
+def write_field(path, values, width, height):
+    """Write a flat array of texture values (e.g. N*N*4 RGBA) as a .bin file."""
+    values = np.ascontiguousarray(values, dtype='<f4').ravel()
+    with open(path, 'wb') as f:
+        f.write(_pack_header(width, height, values.size))
+        f.write(values.tobytes())
+
+
+def write_field_csv(path, values, width, height):
+    """CSV fallback: 'width,height,' followed by the values on one line."""
+    with open(path, 'w') as f:
+        # Header: width,height, (matching the JS comma logic)
+        f.write(f"{width},{height},")
+        np.savetxt(f, np.asarray(values).reshape(1, -1), delimiter=",", fmt="%.10e")
+
+
+def read_field_with_shape(path):
+    """Read a field file with its header: (width, height, flat values)."""
+    if str(path).endswith('.bin'):
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_BYTES)
+            if len(header) != HEADER_BYTES or header[:len(FIELD_MAGIC)] != FIELD_MAGIC:
+                raise ValueError(f"{path} is not a field file (bad header)")
+            width, height, count = np.frombuffer(header, dtype='<u4', offset=len(FIELD_MAGIC))
+            values = np.fromfile(f, dtype='<f4', count=int(count))
+        if values.size != count:
+            raise ValueError(f"{path} is truncated: {values.size} of {count} values")
+        return int(width), int(height), values.astype(np.float64)
+    data = np.loadtxt(path, delimiter=',')
+    return int(data[0]), int(data[1]), data[2:]
+
+
+def read_field(path, csv_header=True):
+    """
+    Read a field file and return its flat values (header stripped).
+
+    .bin files are read with np.fromfile. Anything else is parsed as CSV;
+    set csv_header=False for CSVs without the leading 'width,height'
+    (the browser's result.csv).
+    """
+    if csv_header or str(path).endswith('.bin'):
+        return read_field_with_shape(path)[2]
+    return np.loadtxt(path, delimiter=',')
+
+
+def find_field(folder, stem):
+    """Return the path of folder/stem.bin if it exists, else folder/stem.csv."""
+    bin_path = os.path.join(folder, stem + '.bin')
+    return bin_path if os.path.exists(bin_path) else os.path.join(folder, stem + '.csv')
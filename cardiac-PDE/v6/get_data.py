@@ -1,8 +1,10 @@
 import requests
 import os
 import pickle
+import argparse
 import h5py
 import numpy as np
+from field_io import write_field, write_field_csv
 
 # download data from pdeBench
 links = {}
@@ -37,6 +39,53 @@ links['fk.h5'] = ''
 pde_names['fk.h5'] = 'fenton_karma'
 paras['fk.h5'] = {} 
 
+def download_file(url, file_save_path, chunk_size=1 << 20):
+    """
+    Stream url to file_save_path without holding it in memory.
+
+    Bytes go to a '.part' file that is renamed once complete. If a '.part'
+    file is left over from an interrupted run, the download resumes from its
+    size with an HTTP Range request (restarting if the server ignores it).
+    A finished file is not downloaded again.
+    """
+    if os.path.exists(file_save_path):
+        print(f"{file_save_path} already downloaded, skipping")
+        return file_save_path
+    part_path = file_save_path + '.part'
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    headers = {'Range': f'bytes={offset}-'} if offset else {}
+
+    with requests.get(url, stream=True, headers=headers, timeout=60) as response:
+        if response.status_code == 416:  # range past the end: part file is complete
+            os.replace(part_path, file_save_path)
+            return file_save_path
+        response.raise_for_status()
+        if offset and response.status_code != 206:
+            offset = 0  # server ignored the Range header, start over
+        if offset:
+            print(f"Resuming download at {offset / 1e6:.1f} MB")
+        with open(part_path, 'ab' if offset else 'wb') as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+
+    os.replace(part_path, file_save_path)
+    return file_save_path
+
+def read_first_last(dset, sample_indices):
+    """
+    Read frame 0 and frame -1 of the selected samples from a [N, T, ...]
+    HDF5 dataset. h5py needs increasing indices, so the read is done in
+    sorted order (also the on-disk order) and mapped back afterwards.
+    """
+    sample_indices = np.asarray(sample_indices)
+    order = np.argsort(sample_indices)
+    sorted_indices = sample_indices[order].tolist()
+    first_frames = np.empty((len(sample_indices),) + dset.shape[2:], dtype=dset.dtype)
+    last_frames = np.empty_like(first_frames)
+    first_frames[order] = dset[sorted_indices, 0]
+    last_frames[order] = dset[sorted_indices, -1]
+    return first_frames, last_frames
+
 def transform_1D_to_2D(data_1D, xcoor):
     data_1D_to = data_1D[0]
     data_1D_tend = data_1D[-1]
@@ -55,7 +104,23 @@ def transform_1D_to_2D(data_1D, xcoor):
     rgba_flat_tend = np.dstack([r_channel, g_channel, b_channel, a_channel]).ravel()
     return rgba_flat.reshape(1, -1),rgba_flat_tend.reshape(1, -1)
 
+def save_field(stem, values, width, height, file_format):
+    """Write one IC/solution texture as stem.bin (float32) or stem.csv (fallback)."""
+    if file_format == 'bin':
+        write_field(stem + '.bin', values, width, height)
+    else:
+        write_field_csv(stem + '.csv', values, width, height)
+
 def main():
+    parser = argparse.ArgumentParser(description="Download PDEBench data and split it into IC/solution files.")
+    parser.add_argument(
+        "--format",
+        default="bin",
+        choices=["bin", "csv"],
+        help="IC/solution file format: compact float32 'bin' (default) or text 'csv' (fallback)."
+    )
+    file_format = parser.parse_args().format
+
     for filename in links.keys():
             
         url = links[filename]
@@ -69,16 +134,9 @@ def main():
         print(f"Downloading {filename}...")
         hdf5_file_name = pde_name + '.hdf5'
         try:
-            # Send request
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            
-            # Save the HDF5 file
-
+            # Stream the HDF5 file to disk (resumes a partial download)
             file_save_path = os.path.join(path, hdf5_file_name)
-            with open(file_save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            download_file(url, file_save_path)
             
             # Save the parameters with pickle
             pickle_name = hdf5_file_name.replace('.hdf5', '_paras.pkl')
@@ -99,30 +157,22 @@ def main():
             
             with h5py.File(hdf5_file_path, 'r') as f:
                 
-                data = f['tensor'][:] 
-                tcoor = f['t-coordinate'][:]
+                # only the selected samples' first and last frames are read,
+                # so memory stays constant regardless of the file size
+                data = f['tensor']  # [N, T, X], left on disk
                 xcoor = f['x-coordinate'][:]
-            
-            random_indices = np.random.choice(data.shape[0], size=52, replace=False)
-            random_samples = data[random_indices]
+                random_indices = np.random.choice(data.shape[0], size=52, replace=False)
+                first_frames, last_frames = read_first_last(data, random_indices)
             
             # save IC
             for i in range(52):
-                sample_2D, sample_2D_tend = transform_1D_to_2D(random_samples[i], xcoor)
-                if i < 2:
-                    IC_file = f'./data/{pde_name}/train/IC_{i}.csv'
-                else:
-                    IC_file = f'./data/{pde_name}/test/IC_{i}.csv'
-                with open(IC_file, 'w') as f:
-                    # Header: width,height, (matching the JS comma logic)
-                    f.write(f"{random_samples.shape[2]},{random_samples.shape[2]},")
-                    
-                    # Save the flattened array as a single row
-                    np.savetxt(f, sample_2D, delimiter=",", fmt="%.10e")
-                
-                with open(IC_file.replace('IC', 'solution'), 'w') as f:
-                    f.write(f"{random_samples.shape[2]},{random_samples.shape[2]},")
-                    np.savetxt(f, sample_2D_tend, delimiter=",", fmt="%.10e")
+                sample_2D, sample_2D_tend = transform_1D_to_2D(
+                    np.stack([first_frames[i], last_frames[i]]), xcoor)
+                split = 'train' if i < 2 else 'test'
+                IC_stem = f'./data/{pde_name}/{split}/IC_{i}'
+                save_field(IC_stem, sample_2D, len(xcoor), len(xcoor), file_format)
+                save_field(IC_stem.replace('IC', 'solution'), sample_2D_tend,
+                           len(xcoor), len(xcoor), file_format)
                     
         elif filename == '2D_diff-react_NA_NA.h5':
             hdf5_file_path = f"./data/{pde_name}/{hdf5_file_name}"
@@ -130,35 +180,20 @@ def main():
             with h5py.File(hdf5_file_path, 'r') as f:
                 all_keys = list(f.keys())
                 random_keys = np.random.choice(all_keys, size=102, replace=False)
-                sampled_data_list = [f[key]['data'][:] for key in random_keys]
-                random_samples = np.stack(sampled_data_list)
+                # each trajectory is [T, X, Y, V]; read frame 0 and frame -1 only
+                frame_pairs = [(f[key]['data'][0], f[key]['data'][-1]) for key in random_keys]
 
             # save IC
             for i in range(102):
-                sample_2D = random_samples[i][0]
-                sample_2D_tend = random_samples[i][-1]
-                if i < 2:
-                    IC_file = f'./data/{pde_name}/train/IC_{i}.csv'
-                else: 
-                    IC_file = f'./data/{pde_name}/test/IC_{i}.csv'
-                with open(IC_file, 'w') as f:
-                    # Header: width,height, (matching the JS comma logic)
-                    f.write(f"{sample_2D.shape[0]},{sample_2D.shape[1]},")
-                    rgba = np.zeros((sample_2D.shape[0], sample_2D.shape[1], 4), dtype=sample_2D.dtype)
-                    rgba[..., 0] = sample_2D[..., 0] # Set R
-                    rgba[..., 1] = sample_2D[..., 1] # Set G
-                    flat_rgba = rgba.flatten()
-
-                    np.savetxt(f, flat_rgba.reshape(1, -1), delimiter=",", fmt="%.10e")
-                
-                with open(IC_file.replace('IC', 'solution'), 'w') as f:
-                    f.write(f"{sample_2D_tend.shape[0]},{sample_2D_tend.shape[1]},")
-                    rgba = np.zeros((sample_2D_tend.shape[0], sample_2D_tend.shape[1], 4), dtype=sample_2D_tend.dtype)
-                    rgba[..., 0] = sample_2D_tend[..., 0] # Set R
-                    rgba[..., 1] = sample_2D_tend[..., 1] # Set G
-                    flat_rgba = rgba.flatten()
-
-                    np.savetxt(f, flat_rgba.reshape(1, -1), delimiter=",", fmt="%.10e")
+                sample_2D, sample_2D_tend = frame_pairs[i]
+                split = 'train' if i < 2 else 'test'
+                IC_stem = f'./data/{pde_name}/{split}/IC_{i}'
+                for stem, frame in ((IC_stem, sample_2D),
+                                    (IC_stem.replace('IC', 'solution'), sample_2D_tend)):
+                    rgba = np.zeros((frame.shape[0], frame.shape[1], 4), dtype=frame.dtype)
+                    rgba[..., 0] = frame[..., 0] # Set R
+                    rgba[..., 1] = frame[..., 1] # Set G
+                    save_field(stem, rgba, frame.shape[0], frame.shape[1], file_format)
                     
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -47,7 +47,7 @@ Output:
 """
 
 refine_prompt = """
-Refine the simulation code in {simulation_codes} to achieve a lower nRMSE than the current {nrmse} and maximize execution speed for the system described in {pde_desc}. Implement the most numerically accurate and computationally efficient integration and spatial discretization methods suitable for this specific system, optimizing GLSL performance and memory access patterns for peak efficiency. You must maintain the original application logic—specifically the CSV data loading, file downloading, and GUI infrastructure—entirely unchanged, focusing all improvements strictly on mathematical simulation quality and coding efficiency to ensure high-order precision and stability while preserving the existing structural integrity.
+Refine the simulation code in {simulation_codes} to achieve a lower nRMSE than the current {nrmse} and maximize execution speed for the system described in {pde_desc}. Implement the most numerically accurate and computationally efficient integration and spatial discretization methods suitable for this specific system, optimizing GLSL performance and memory access patterns for peak efficiency. You must maintain the original application logic—specifically the IC field loading (binary .bin files with the 16-byte 'WPDF' header, with the CSV fallback), the binary result download, and the GUI infrastructure—entirely unchanged, focusing all improvements strictly on mathematical simulation quality and coding efficiency to ensure high-order precision and stability while preserving the existing structural integrity.
 
 Output only the raw html code. No talk, no markdown, just code.
 """
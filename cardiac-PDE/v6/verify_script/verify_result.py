@@ -18,7 +18,7 @@ def load_IC(LLM,simulation_file_path: str, IC_file_path: str, T_end: float = 100
 
     Args:
         simulation_file (str): The relative path to the simulation file (html).
-        IC_file (str): The path to the initial condition file (csv), relative to the simulation file.
+        IC_file (str): The path to the initial condition file (.bin or .csv), relative to the simulation file.
         T_end (float): The end time value. Defaults to 100.0.
     """
     # first, copy simulation file to the same folder as IC file.
@@ -69,10 +69,10 @@ def verify_result(LLM,simulation_file_path: str, IC_file_path: str, T_end: float
     download_path = Path(download_folder).resolve()
     download_path.mkdir(parents=True, exist_ok=True)
     
-    target_file = download_path / "result.csv"
-    if target_file.exists():
-        print(f"Removing old {target_file.name} to prevent renaming...")
-        target_file.unlink()
+    for target_file in (download_path / "result.csv", download_path / "result.bin"):
+        if target_file.exists():
+            print(f"Removing old {target_file.name} to prevent renaming...")
+            target_file.unlink()
             
     def start_server():
         """Starts a local server in the specified directory."""